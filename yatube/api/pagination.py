@@ -0,0 +1,60 @@
+"""Курсорная пагинация по (created, id) в порядке убывания.
+
+В отличие от OFFSET, стоимость страницы не растёт с её номером:
+каждая следующая страница — это диапазон по индексу от курсора.
+"""
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from posts.const import POSTLIM
+
+MAX_LIMIT = 100
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(row):
+    raw = f'{row["created"].isoformat()}|{row["id"]}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created, pk = raw.rsplit('|', 1)
+        created = parse_datetime(created)
+        pk = int(pk)
+    except (ValueError, binascii.Error, UnicodeError):
+        created = None
+    if created is None:
+        raise CursorError('Некорректный курсор')
+    return created, pk
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', POSTLIM))
+    except ValueError:
+        limit = POSTLIM
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def paginate(request, queryset, lookups):
+    """Строки .values() для текущей страницы и курсор следующей."""
+    queryset = queryset.order_by('-created', '-id')
+    cursor = request.GET.get('cursor')
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created__lt=created) | Q(created=created, id__lt=pk)
+        )
+    limit = get_limit(request)
+    lookups = set(lookups) | {'id', 'created'}
+    rows = list(queryset.values(*lookups)[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
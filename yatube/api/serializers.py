@@ -0,0 +1,72 @@
+"""Сериализация для API прямо из .values(), без создания моделей.
+
+Поле ответа отображается на поле выборки; клиент может запросить
+только часть полей параметром ?fields=.
+"""
+from django.conf import settings
+
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'excerpt': 'excerpt',
+    'created': 'created',
+    'author': 'author__username',
+    'group': 'group__slug',
+    'image': 'image',
+}
+
+COMMENT_FIELDS = {
+    'id': 'id',
+    'post': 'post_id',
+    'text': 'text',
+    'created': 'created',
+    'author': 'author__username',
+}
+
+GROUP_FIELDS = {
+    'title': 'title',
+    'slug': 'slug',
+    'description': 'description',
+}
+
+
+class FieldsError(ValueError):
+    pass
+
+
+def select_fields(request, fields):
+    """Поля ответа из параметра ?fields= (по умолчанию все)."""
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(fields)
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = set(names) - set(fields)
+    if unknown:
+        raise FieldsError(
+            f'Неизвестные поля: {", ".join(sorted(unknown))}'
+        )
+    return names
+
+
+def media_url(path):
+    return f'{settings.MEDIA_URL}{path}' if path else None
+
+
+CONVERTERS = {
+    'image': media_url,
+}
+
+
+def serialize(rows, fields, names):
+    """Словари ответа из строк .values() с нужными полями."""
+    return [
+        {
+            name: CONVERTERS.get(name, _same)(row[fields[name]])
+            for name in names
+        }
+        for row in rows
+    ]
+
+
+def _same(value):
+    return value
@@ -0,0 +1,165 @@
+import json
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post, User
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='api_author')
+        cls.reader = User.objects.create_user(username='api_reader')
+        cls.group = Group.objects.create(
+            title='Группа API',
+            slug='api-slug',
+            description='Описание',
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.author, text=f'Запись {i}', group=cls.group
+            )
+            for i in range(15)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def post_json(self, client, url, data):
+        return client.post(
+            url, data=json.dumps(data), content_type='application/json'
+        )
+
+    def test_post_list_cursor_pagination(self):
+        """Курсор отдаёт следующую страницу без повторов"""
+        url = reverse('api:post_list')
+        first = self.guest_client.get(url).json()
+        self.assertEqual(len(first['results']), 10)
+        second = self.guest_client.get(
+            url, {'cursor': first['next']}
+        ).json()
+        self.assertEqual(len(second['results']), 5)
+        self.assertIsNone(second['next'])
+        ids = [post['id'] for post in first['results'] + second['results']]
+        self.assertEqual(len(set(ids)), 15)
+
+    def test_sparse_fields(self):
+        """Параметр fields оставляет в ответе только нужные поля"""
+        response = self.guest_client.get(
+            reverse('api:post_list'), {'fields': 'id,author'}
+        )
+        post = response.json()['results'][0]
+        self.assertEqual(set(post), {'id', 'author'})
+        self.assertEqual(post['author'], self.author.username)
+        response = self.guest_client.get(
+            reverse('api:post_list'), {'fields': 'password'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_etag_not_modified(self):
+        """Повторный запрос с ETag получает 304"""
+        url = reverse('api:post_detail', kwargs={'post_id': self.posts[0].pk})
+        response = self.guest_client.get(url)
+        response = self.guest_client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_create_post_and_comment(self):
+        """Гость не может писать, пользователь может"""
+        url = reverse('api:post_list')
+        response = self.post_json(self.guest_client, url, {'text': 'Новая'})
+        self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+        response = self.post_json(
+            self.reader_client, url, {'text': 'Новая', 'group': self.group.pk}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertEqual(response.json()['group'], self.group.slug)
+        post_id = response.json()['id']
+        response = self.post_json(
+            self.reader_client,
+            reverse('api:post_comments', kwargs={'post_id': post_id}),
+            {'text': 'Коммент'},
+        )
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertTrue(
+            Comment.objects.filter(post_id=post_id, text='Коммент').exists()
+        )
+
+    def test_follow_and_unfollow(self):
+        """Подписка и отписка через API"""
+        response = self.post_json(
+            self.reader_client,
+            reverse('api:follow_list'),
+            {'username': self.author.username},
+        )
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        response = self.reader_client.get(reverse('api:follow_list'))
+        self.assertEqual(response.json(), [self.author.username])
+        response = self.reader_client.delete(
+            reverse('api:follow_detail',
+                    kwargs={'username': self.author.username})
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        self.assertFalse(Follow.objects.exists())
+
+
+class ApiCsrfTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username='mobile', password='mobile-pass')
+        self.client = Client(enforce_csrf_checks=True)
+
+    def post_json(self, url, data, **headers):
+        return self.client.post(
+            url, data=json.dumps(data), content_type='application/json',
+            **headers
+        )
+
+    def test_write_without_token_rejected_as_json(self):
+        """Запись без токена CSRF — 403 в JSON, а не страница 200"""
+        self.client.login(username='mobile', password='mobile-pass')
+        for url in (reverse('api:post_list'), reverse('api:follow_list')):
+            with self.subTest(url=url):
+                response = self.post_json(url, {'text': 'Запись'})
+                self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+                self.assertIn('CSRF', response.json()['detail'])
+        self.assertFalse(Post.objects.exists())
+
+    def test_session_flow(self):
+        """Токен, вход и запись через API без HTML-формы"""
+        url = reverse('api:auth')
+        token = self.client.get(url).json()['csrf_token']
+        response = self.post_json(
+            url, {'username': 'mobile', 'password': 'wrong'},
+            HTTP_X_CSRFTOKEN=token,
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        response = self.post_json(
+            url, {'username': 'mobile', 'password': 'mobile-pass'},
+            HTTP_X_CSRFTOKEN=token,
+        )
+        self.assertEqual(response.json()['username'], 'mobile')
+        token = response.json()['csrf_token']
+        response = self.post_json(
+            reverse('api:post_list'), {'text': 'С телефона'},
+            HTTP_X_CSRFTOKEN=token,
+        )
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        response = self.client.delete(url, HTTP_X_CSRFTOKEN=token)
+        self.assertIsNone(response.json()['username'])
+
+
+class CsrfFailureTests(TestCase):
+    def test_site_csrf_failure_is_403(self):
+        """Страница ошибки CSRF на сайте отдаётся с кодом 403"""
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(reverse('users:login'), {'username': 'x'})
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
@@ -0,0 +1,23 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('v1/auth/', views.auth, name='auth'),
+    path('v1/posts/', views.post_list, name='post_list'),
+    path('v1/posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path(
+        'v1/posts/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
+    path('v1/groups/', views.group_list, name='group_list'),
+    path('v1/follow/', views.follow_list, name='follow_list'),
+    path(
+        'v1/follow/<str:username>/',
+        views.follow_detail,
+        name='follow_detail'
+    ),
+]
@@ -0,0 +1,258 @@
+"""JSON API для мобильных и сторонних клиентов.
+
+Аутентификация — та же сессия, что и у сайта, без разбора HTML-формы:
+
+1. GET /api/v1/auth/ ставит cookie csrftoken и возвращает тот же токен
+   в поле csrf_token;
+2. POST /api/v1/auth/ с {"username": ..., "password": ...} и заголовком
+   X-CSRFToken входит в систему: ответ ставит cookie sessionid и
+   отдаёт новый csrf_token (при входе токен меняется);
+3. все запросы, кроме GET, передают cookie и X-CSRFToken;
+   DELETE /api/v1/auth/ — выход.
+
+Без токена запись отклоняется ответом 403 в JSON (core.views.csrf_failure).
+"""
+import json
+from functools import wraps
+from http import HTTPStatus
+
+from django.contrib.auth import authenticate, login, logout
+from django.http import HttpResponse, JsonResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, set_response_etag
+from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import require_http_methods
+
+from core.decorators import ratelimit
+from notifications import inbox
+from notifications.models import Notification
+from posts.forms import CommentForm, PostForm
+from posts.models import Comment, Follow, Group, Post, User
+from users.decorators import login_throttled
+
+from .pagination import CursorError, paginate
+from .serializers import (COMMENT_FIELDS, GROUP_FIELDS, POST_FIELDS,
+                          FieldsError, select_fields, serialize)
+
+
+class BodyError(ValueError):
+    pass
+
+
+def error(message, status):
+    return JsonResponse({'detail': message}, status=status)
+
+
+def json_response(request, data, status=HTTPStatus.OK):
+    """JSON-ответ; на GET отдаёт ETag и 304, если клиент его уже видел."""
+    response = JsonResponse(data, status=status, safe=False)
+    if request.method != 'GET':
+        return response
+    set_response_etag(response)
+    return get_conditional_response(
+        request, etag=response['ETag'], response=response
+    )
+
+
+def read_json(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        raise BodyError('Тело запроса должно быть JSON-объектом')
+    if not isinstance(data, dict):
+        raise BodyError('Тело запроса должно быть JSON-объектом')
+    return data
+
+
+def api_view(methods):
+    """Разрешённые методы и ошибки клиента в виде JSON с кодом 400."""
+    def decorator(view_func):
+        @require_http_methods(methods)
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            try:
+                return view_func(request, *args, **kwargs)
+            except (BodyError, CursorError, FieldsError) as exc:
+                return error(str(exc), HTTPStatus.BAD_REQUEST)
+        return wrapper
+    return decorator
+
+
+def unauthorized():
+    return error('Требуется авторизация', HTTPStatus.UNAUTHORIZED)
+
+
+def not_found():
+    return error('Не найдено', HTTPStatus.NOT_FOUND)
+
+
+def form_errors(form):
+    return JsonResponse(
+        {'errors': form.errors}, status=HTTPStatus.BAD_REQUEST
+    )
+
+
+def get_post_data(pk, names=None):
+    names = names or list(POST_FIELDS)
+    rows = Post.objects.filter(pk=pk).values(
+        *(POST_FIELDS[name] for name in names)
+    )
+    data = serialize(rows, POST_FIELDS, names)
+    return data[0] if data else None
+
+
+def page_response(request, queryset, fields):
+    names = select_fields(request, fields)
+    rows, next_cursor = paginate(
+        request, queryset, [fields[name] for name in names]
+    )
+    return json_response(request, {
+        'results': serialize(rows, fields, names),
+        'next': next_cursor,
+    })
+
+
+def session_data(request):
+    user = request.user
+    return {
+        'username': user.username if user.is_authenticated else None,
+        'csrf_token': get_token(request),
+    }
+
+
+@api_view(['GET', 'POST', 'DELETE'])
+@ensure_csrf_cookie
+def auth(request):
+    """Текущая сессия: токен CSRF, вход и выход."""
+    if request.method == 'POST':
+        data = read_json(request)
+        throttled = login_throttled(request, data.get('username'))
+        if throttled is not None:
+            return throttled
+        user = authenticate(
+            request,
+            username=data.get('username'),
+            password=data.get('password'),
+        )
+        if user is None:
+            return error(
+                'Неверное имя пользователя или пароль',
+                HTTPStatus.BAD_REQUEST,
+            )
+        login(request, user)
+    elif request.method == 'DELETE':
+        logout(request)
+    return json_response(request, session_data(request))
+
+
+@api_view(['GET', 'POST'])
+@ratelimit('post_create', methods=('POST',))
+def post_list(request):
+    if request.method == 'POST':
+        return post_create(request)
+    posts = Post.objects.all()
+    if 'group' in request.GET:
+        posts = posts.filter(group__slug=request.GET['group'])
+    if 'author' in request.GET:
+        posts = posts.filter(author__username=request.GET['author'])
+    return page_response(request, posts, POST_FIELDS)
+
+
+def post_create(request):
+    if not request.user.is_authenticated:
+        return unauthorized()
+    form = PostForm(read_json(request))
+    if not form.is_valid():
+        return form_errors(form)
+    post = form.save(commit=False)
+    post.author = request.user
+    post.save()
+    return json_response(
+        request, get_post_data(post.pk), status=HTTPStatus.CREATED
+    )
+
+
+@api_view(['GET'])
+def post_detail(request, post_id):
+    data = get_post_data(post_id, select_fields(request, POST_FIELDS))
+    if data is None:
+        return not_found()
+    return json_response(request, data)
+
+
+@api_view(['GET', 'POST'])
+@ratelimit('add_comment', methods=('POST',))
+def post_comments(request, post_id):
+    if not Post.objects.filter(pk=post_id).exists():
+        return not_found()
+    if request.method == 'GET':
+        return page_response(
+            request, Comment.objects.filter(post_id=post_id), COMMENT_FIELDS
+        )
+    if not request.user.is_authenticated:
+        return unauthorized()
+    form = CommentForm(read_json(request))
+    if not form.is_valid():
+        return form_errors(form)
+    comment = form.save(commit=False)
+    comment.author = request.user
+    comment.post_id = post_id
+    comment.save()
+    inbox.comments_posted([comment])
+    rows = Comment.objects.filter(pk=comment.pk).values(
+        *COMMENT_FIELDS.values()
+    )
+    return json_response(
+        request,
+        serialize(rows, COMMENT_FIELDS, list(COMMENT_FIELDS))[0],
+        status=HTTPStatus.CREATED,
+    )
+
+
+@api_view(['GET'])
+def group_list(request):
+    names = select_fields(request, GROUP_FIELDS)
+    rows = Group.objects.order_by('title').values(
+        *(GROUP_FIELDS[name] for name in names)
+    )
+    return json_response(request, serialize(rows, GROUP_FIELDS, names))
+
+
+@api_view(['GET', 'POST'])
+@ratelimit('profile_follow', methods=('POST',))
+def follow_list(request):
+    if not request.user.is_authenticated:
+        return unauthorized()
+    if request.method == 'GET':
+        authors = Follow.objects.filter(user=request.user).order_by(
+            'author__username'
+        ).values_list('author__username', flat=True)
+        return json_response(request, list(authors))
+    username = read_json(request).get('username')
+    author = User.objects.filter(username=username).only('id').first()
+    if author is None:
+        return not_found()
+    if author == request.user:
+        return error('Нельзя подписаться на себя', HTTPStatus.BAD_REQUEST)
+    _, created = Follow.objects.get_or_create(
+        user=request.user, author=author
+    )
+    if created:
+        inbox.notify(Notification.FOLLOW, request.user, [author.pk])
+    return json_response(
+        request,
+        {'username': username},
+        status=HTTPStatus.CREATED if created else HTTPStatus.OK,
+    )
+
+
+@api_view(['DELETE'])
+def follow_detail(request, username):
+    if not request.user.is_authenticated:
+        return unauthorized()
+    deleted, _ = Follow.objects.filter(
+        user=request.user, author__username=username
+    ).delete()
+    if not deleted:
+        return not_found()
+    return HttpResponse(status=HTTPStatus.NO_CONTENT)
@@ -0,0 +1,226 @@
+"""Сценарии для команды benchmark.
+
+Каждый сценарий возвращает строки (название, до, после) в миллисекундах.
+"""
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIHandler
+from django.template import Context, Template
+from django.template.loader import get_template
+from django.test import Client, RequestFactory
+from django.urls import resolve, reverse
+
+from users.hashers import BoundedPBKDF2PasswordHasher
+from .context_processors.navigation import navigation
+from .context_processors.year import current_year
+from .warmup import reset_templates, warm_templates
+
+FIRST_REQUEST_URLS = (
+    'posts:index',
+    'about:author',
+    'about:tech',
+    'users:login',
+    'users:signup',
+)
+
+
+def _timed_get(client, url):
+    cache.clear()
+    start = time.perf_counter()
+    client.get(url)
+    return (time.perf_counter() - start) * 1000
+
+
+def first_request_latency(repeat):
+    """Первый запрос к view в холодном и в прогретом процессе."""
+    client = Client()
+    rows = []
+    for name in FIRST_REQUEST_URLS:
+        url = reverse(name)
+        cold, warm = [], []
+        for _ in range(repeat):
+            reset_templates()
+            cold.append(_timed_get(client, url))
+            reset_templates()
+            warm_templates()
+            warm.append(_timed_get(client, url))
+        rows.append(
+            (url, statistics.median(cold), statistics.median(warm))
+        )
+    return rows
+
+
+# Шапка в том виде, в каком она была до предвычисленной навигации.
+LEGACY_HEADER = """{% load static %}
+<nav class="navbar navbar-light" style="background-color: lightskyblue">
+  <div class="container">
+    <a class="navbar-brand" href="{% url 'posts:index' %}">
+      <img src="{% static 'img/logo.png' %}" width="30" height="30">
+    </a>
+    <ul class="nav nav-pills">
+      {% with request.resolver_match.view_name as view_name %}
+      <li><a class="{% if view_name == 'about:author' %}active{% endif %}"
+        href="{% url 'about:author' %}">Об авторе</a></li>
+      <li><a class="{% if view_name == 'about:tech' %}active{% endif %}"
+        href="{% url 'about:tech' %}">Технологии</a></li>
+      {% if user.is_authenticated %}
+      <li><a class="{% if view_name == 'posts:post_create' %}active{% endif %}"
+        href="{% url 'posts:post_create' %}">Новая запись</a></li>
+      <li><a href="<!--  -->">Изменить пароль</a></li>
+      <li><a class="{% if view_name == 'users:logout' %}active{% endif %}"
+        href="{% url 'users:logout' %}">Выйти</a></li>
+      <li>Пользователь: {{ user.username }}</li>
+      {% else %}
+      <li><a class="{% if view_name == 'users:login' %}active{% endif %}"
+        href="{% url 'users:login' %}">Войти</a></li>
+      <li><a class="{% if view_name == 'users:signup' %}active{% endif %}"
+        href="{% url 'users:signup' %}">Регистрация</a></li>
+      {% endif %}
+      {% endwith %}
+    </ul>
+  </div>
+</nav>
+"""
+
+HEADER_RENDERS = 500
+
+
+def _cpu_per_render(render):
+    start = time.process_time()
+    for _ in range(HEADER_RENDERS):
+        render()
+    return (time.process_time() - start) * 1000 / HEADER_RENDERS
+
+
+def header_render_cpu(repeat):
+    """Процессорное время на шапку и год в подвале одного запроса."""
+    request = RequestFactory().get('/')
+    request.resolver_match = resolve('/')
+    legacy = Template(LEGACY_HEADER)
+    current = get_template('includes/header.html').template
+    users = (
+        ('шапка, гость', AnonymousUser()),
+        ('шапка, пользователь', get_user_model()(username='bench')),
+    )
+    rows = []
+    for label, user in users:
+        request.user = user
+
+        def render_legacy():
+            legacy.render(Context({
+                'request': request,
+                'user': user,
+                'year': datetime.now().year,
+            }))
+
+        def render_current():
+            current.render(Context({
+                'request': request,
+                'user': user,
+                'year': current_year(),
+                **navigation(request),
+            }))
+
+        before = [_cpu_per_render(render_legacy) for _ in range(repeat)]
+        after = [_cpu_per_render(render_current) for _ in range(repeat)]
+        rows.append(
+            (label, statistics.median(before), statistics.median(after))
+        )
+    return rows
+
+
+CONCURRENCY_URLS = ('posts:index', 'about:author')
+CONCURRENT_REQUESTS = 32
+THREADS = 8
+SLOW_IO = 0.02
+
+
+def _slow_io_app(handler):
+    """WSGI-приложение, которое перед ответом ждёт медленный ввод-вывод."""
+    def app(environ, start_response):
+        time.sleep(SLOW_IO)
+        return handler(environ, start_response)
+    return app
+
+
+def _serve(app, environ, threads):
+    def call(_):
+        body = app(dict(environ), lambda status, headers: None)
+        b''.join(body)
+        body.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(CONCURRENT_REQUESTS)))
+    return (time.perf_counter() - start) * 1000
+
+
+def threaded_concurrency(repeat):
+    """Пачка запросов одним воркером: один поток против профиля gthread."""
+    app = _slow_io_app(WSGIHandler())
+    factory = RequestFactory()
+    rows = []
+    for name in CONCURRENCY_URLS:
+        url = reverse(name)
+        environ = factory.get(url).environ
+        single = [_serve(app, environ, 1) for _ in range(repeat)]
+        threaded = [_serve(app, environ, THREADS) for _ in range(repeat)]
+        rows.append((
+            f'{url} x{CONCURRENT_REQUESTS}',
+            statistics.median(single),
+            statistics.median(threaded),
+        ))
+    return rows
+
+
+LOGIN_BURST = 16
+
+
+def _login_burst(hasher, client, url):
+    """Время пачки проверок пароля и медиана чтения страницы во время неё."""
+    encoded = hasher.encode('correct-password', hasher.salt())
+    reads = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=LOGIN_BURST) as pool:
+        logins = [
+            pool.submit(hasher.verify, 'wrong-password', encoded)
+            for _ in range(LOGIN_BURST)
+        ]
+        while not all(login.done() for login in logins):
+            reads.append(_timed_get(client, url))
+    burst = (time.perf_counter() - start) * 1000
+    return burst, statistics.median(reads) if reads else 0.0
+
+
+def login_burst_hashing(repeat):
+    """Всплеск входов: PBKDF2 во всех потоках против ограниченного пула."""
+    client = Client()
+    url = reverse('about:author')
+    results = {}
+    for hasher in (PBKDF2PasswordHasher(), BoundedPBKDF2PasswordHasher()):
+        runs = [_login_burst(hasher, client, url) for _ in range(repeat)]
+        results[type(hasher)] = (
+            statistics.median(burst for burst, _ in runs),
+            statistics.median(read for _, read in runs),
+        )
+    before = results[PBKDF2PasswordHasher]
+    after = results[BoundedPBKDF2PasswordHasher]
+    return [
+        (f'{LOGIN_BURST} входов', before[0], after[0]),
+        (f'{url} во время входов', before[1], after[1]),
+    ]
+
+
+SCENARIOS = {
+    'templates': first_request_latency,
+    'header': header_render_cpu,
+    'concurrency': threaded_concurrency,
+    'hashing': login_burst_hashing,
+}
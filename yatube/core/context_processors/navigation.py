@@ -0,0 +1,12 @@
+from core.navigation import home_url, nav_items, static_url
+
+
+def navigation(request):
+    """Шапка сайта без повторных reverse() и static() на каждый запрос."""
+    match = request.resolver_match
+    return {
+        'nav_home': home_url(),
+        'nav_logo': static_url('img/logo.png'),
+        'nav_items': nav_items(request.user.is_authenticated),
+        'nav_active': match.view_name if match else None,
+    }
@@ -1,7 +1,24 @@
+import time
 from datetime import datetime
 
+_year = None
+_next_year_at = float('-inf')
+
+
+def current_year():
+    """Текущий год; пересчитывается только при смене года.
+
+    На каждом запросе только time.time() сравнивается с заранее
+    посчитанным началом следующего года, без создания datetime.
+    """
+    global _year, _next_year_at
+    if time.time() >= _next_year_at:
+        _year = datetime.now().year
+        _next_year_at = datetime(_year + 1, 1, 1).timestamp()
+    return _year
+
 
 def year(request):
     return {
-        'year': datetime.now().year
+        'year': current_year()
     }
@@ -0,0 +1,87 @@
+import math
+import time
+from functools import wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+def client_ip(request):
+    """IP клиента для лимитов с учётом доверенных прокси.
+
+    Каждый из settings.TRUSTED_PROXY_COUNT прокси дописывает адрес
+    своего клиента в конец заголовка settings.CLIENT_IP_HEADER, поэтому
+    адрес берётся на столько позиций от конца: значения левее мог
+    подставить сам клиент. Без прокси или без заголовка — REMOTE_ADDR.
+    """
+    hops = settings.TRUSTED_PROXY_COUNT
+    if hops:
+        forwarded = request.META.get(settings.CLIENT_IP_HEADER, '')
+        addrs = [addr.strip() for addr in forwarded.split(',')
+                 if addr.strip()]
+        if len(addrs) >= hops:
+            return addrs[-hops]
+    return request.META.get('REMOTE_ADDR')
+
+
+def is_rate_limited(key, limit, period):
+    """Засчитывает обращение и проверяет, исчерпан ли лимит.
+
+    Это фиксированное окно, а не token bucket: обращения копятся в
+    корзине текущего окна длиной period секунд. Ведру токенов нужно
+    атомарно прочитать и переписать значение, а кэш умеет атомарно
+    только add и incr; на них счётчик окна не теряет параллельных
+    обращений и не обращается к БД. Цена — на стыке окон возможен
+    всплеск до 2 * limit обращений.
+    """
+    window = int(time.time() // period)
+    bucket = f'ratelimit:{key}:{window}'
+    cache.add(bucket, 0, period)
+    try:
+        hits = cache.incr(bucket)
+    except ValueError:
+        # Корзина истекла между add и incr.
+        cache.set(bucket, 1, period)
+        hits = 1
+    return hits > limit
+
+
+def window_remaining(period):
+    """Секунды до конца текущего окна, не меньше одной."""
+    return max(1, math.ceil(period - time.time() % period))
+
+
+def too_many_requests(period):
+    response = HttpResponse(
+        'Слишком много запросов, попробуйте позже.',
+        content_type='text/plain; charset=utf-8',
+        status=HTTPStatus.TOO_MANY_REQUESTS,
+    )
+    # Счётчик обнулится с началом следующего окна.
+    response['Retry-After'] = str(window_remaining(period))
+    return response
+
+
+def ratelimit(scope, methods=None):
+    """Ограничивает частоту вызовов view для одного пользователя.
+
+    Лимиты задаются в settings.RATELIMITS как {scope: (запросов, секунд)}.
+    Если methods передан, ограничиваются только запросы этих методов.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            rate = settings.RATELIMITS.get(scope)
+            if rate and (methods is None or request.method in methods):
+                limit, period = rate
+                if request.user.is_authenticated:
+                    ident = f'user:{request.user.pk}'
+                else:
+                    ident = f'ip:{client_ip(request)}'
+                if is_rate_limited(f'{scope}:{ident}', limit, period):
+                    return too_many_requests(period)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
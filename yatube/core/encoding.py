@@ -0,0 +1,26 @@
+"""Разбор Accept-Encoding для сжатых ответов и статики."""
+
+
+def accepted_encodings(header):
+    """Кодировки из заголовка и их веса q: {'gzip': 1.0, 'br': 0.0}."""
+    weights = {}
+    for item in (header or '').split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.lower()] = weight
+    return weights
+
+
+def accepts_encoding(header, coding):
+    """Принимает ли клиент кодировку: q=0 означает явный отказ."""
+    weights = accepted_encodings(header)
+    return weights.get(coding, weights.get('*', 0.0)) > 0
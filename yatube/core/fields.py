@@ -0,0 +1,92 @@
+from django.db import models
+
+from . import markup
+
+ELLIPSIS = '…'
+
+
+def excerpt(text, length):
+    """Начало текста не длиннее length символов, обрезанное по слову."""
+    text = text.strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    if not text[length].isspace():
+        # Не оставляем половину слова; одно длинное слово режем как есть.
+        cut = cut.rsplit(None, 1)[0] if len(cut.split()) > 1 else cut
+    return cut.rstrip(' \t\n\r.,;:!?-—') + ELLIPSIS
+
+
+class ExcerptField(models.CharField):
+    """Начало другого текстового поля, пересчитывается при сохранении.
+
+    Значение вычисляется в pre_save, поэтому оно заполняется и при
+    save(), и при bulk_create(). Лентам достаточно этой колонки, а полный
+    текст можно не загружать: .defer(source). Был ли текст обрезан,
+    хранится в булевом поле truncated_field (объявленном после этого):
+    по многоточию в конце не отличить обрезанный текст от текста,
+    который сам кончается на «…».
+    """
+
+    def __init__(self, *args, source='text', length=300,
+                 truncated_field=None, **kwargs):
+        self.source = source
+        self.length = length
+        self.truncated_field = truncated_field
+        kwargs['max_length'] = length + len(ELLIPSIS)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs['max_length']
+        kwargs['source'] = self.source
+        kwargs['length'] = self.length
+        if self.truncated_field:
+            kwargs['truncated_field'] = self.truncated_field
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        text = model_instance.__dict__.get(self.source)
+        if text is None:
+            # Исходное поле отложено (defer) и не менялось.
+            return getattr(model_instance, self.attname)
+        value = excerpt(text, self.length)
+        setattr(model_instance, self.attname, value)
+        if self.truncated_field:
+            setattr(model_instance, self.truncated_field,
+                    len(text.strip()) > self.length)
+        return value
+
+
+class RenderedTextField(models.TextField):
+    """HTML, отрисованный из другого текстового поля при сохранении.
+
+    Рядом хранится хэш исходного текста (поле hash_field, объявленное
+    после этого): пока текст не изменился, повторной отрисовки нет. Как и
+    ExcerptField, работает и при bulk_create().
+    """
+
+    def __init__(self, *args, source='text', hash_field='text_hash',
+                 **kwargs):
+        self.source = source
+        self.hash_field = hash_field
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        kwargs['hash_field'] = self.hash_field
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        text = model_instance.__dict__.get(self.source)
+        current = getattr(model_instance, self.attname)
+        if text is None:
+            return current
+        digest = markup.text_hash(text)
+        if current and getattr(model_instance, self.hash_field) == digest:
+            return current
+        value = markup.render(text)
+        setattr(model_instance, self.attname, value)
+        setattr(model_instance, self.hash_field, digest)
+        return value
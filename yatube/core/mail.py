@@ -0,0 +1,99 @@
+"""Отправка почты через очередь в БД.
+
+OutboxEmailBackend подключается как EMAIL_BACKEND: письма (сброс пароля,
+сводки уведомлений) не отправляются во время запроса, а сохраняются в
+таблицу OutboxMessage одним INSERT. Команда send_outbox забирает их
+пачками и отправляет через settings.OUTBOX_DELIVERY_BACKEND, открывая
+одно соединение на пачку. Рассчитано на один процесс send_outbox.
+
+В очереди хранится готовое MIME-сообщение и адреса конверта, а не
+объект EmailMessage: строки не зависят от версии Python и Django.
+"""
+from datetime import timedelta
+from email import message_from_bytes
+from email.message import Message
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.message import MIMEMixin
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+
+class StoredMIME(MIMEMixin, Message):
+    """Разобранное сообщение, которое бэкенды Django умеют сериализовать."""
+
+
+class StoredEmailMessage(EmailMessage):
+    """Письмо из очереди: MIME отдаётся как есть, без повторной сборки."""
+
+    def __init__(self, mime, from_email, recipients):
+        super().__init__(from_email=from_email, to=recipients)
+        self.mime = mime
+
+    def message(self):
+        return message_from_bytes(self.mime, _class=StoredMIME)
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        outbox = [
+            OutboxMessage(
+                message=email_message.message().as_bytes(),
+                from_email=email_message.from_email,
+                recipients='\n'.join(email_message.recipients()),
+            )
+            for email_message in email_messages
+            if email_message.recipients()
+        ]
+        OutboxMessage.objects.bulk_create(outbox)
+        return len(outbox)
+
+
+def _postpone(row, error):
+    row.attempts += 1
+    row.last_error = repr(error)
+    # Повторные попытки всё реже: 1, 2, 4... интервала.
+    row.next_attempt = timezone.now() + timedelta(
+        seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (row.attempts - 1)
+    )
+    row.save(update_fields=('attempts', 'last_error', 'next_attempt'))
+
+
+def deliver(batch_size=None):
+    """Отправляет одну пачку писем. Возвращает (отправлено, с ошибкой)."""
+    batch = list(OutboxMessage.objects.filter(
+        next_attempt__lte=timezone.now(),
+        attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+    )[:batch_size or settings.OUTBOX_BATCH_SIZE])
+    if not batch:
+        return 0, 0
+    connection = get_connection(settings.OUTBOX_DELIVERY_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        # Сервер недоступен: откладывается вся пачка.
+        for row in batch:
+            _postpone(row, error)
+        return 0, len(batch)
+    sent = []
+    failed = 0
+    try:
+        for row in batch:
+            email_message = StoredEmailMessage(
+                bytes(row.message), row.from_email,
+                row.recipients.split('\n'),
+            )
+            try:
+                connection.send_messages([email_message])
+            except Exception as error:
+                failed += 1
+                _postpone(row, error)
+            else:
+                sent.append(row.pk)
+    finally:
+        connection.close()
+    OutboxMessage.objects.filter(pk__in=sent).delete()
+    return len(sent), failed
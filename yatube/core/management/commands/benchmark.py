@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import SCENARIOS
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время выполнения сценариев до и после оптимизаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenarios', nargs='*',
+            help=f'Сценарии для запуска: {", ".join(sorted(SCENARIOS))}.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Число повторов, в отчёт идёт медиана.',
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['scenarios']) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Неизвестные сценарии: {", ".join(unknown)}')
+        for name in options['scenarios'] or sorted(SCENARIOS):
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(f'{"":40} {"до, мс":>10} {"после, мс":>10}')
+            for label, before, after in SCENARIOS[name](options['repeat']):
+                self.stdout.write(f'{label:40} {before:10.2f} {after:10.2f}')
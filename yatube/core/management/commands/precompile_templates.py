@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Разбирает все шаблоны проекта и сообщает об ошибках в них.'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        count = warm_templates()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stdout.write(
+            f'Шаблонов разобрано: {count} за {elapsed:.1f} мс'
+        )
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import mail
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди OutboxMessage.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Сколько писем отправлять через одно соединение.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Проверять очередь каждые N секунд (0 — один проход).',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = mail.deliver(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, с ошибкой: {failed}'
+                )
+            if sent:
+                # В очереди могут быть ещё письма: берём следующую пачку.
+                continue
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
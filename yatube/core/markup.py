@@ -0,0 +1,82 @@
+"""Разметка текстов записей и комментариев.
+
+Текст режется на ссылки, упоминания @username и хэштеги #тег, всё
+остальное экранируется, поэтому в результат не попадает ни один тег
+пользователя. Отрисовка идёт один раз при сохранении: результат хранится
+в колонке RenderedTextField вместе с хэшем исходного текста.
+"""
+import hashlib
+import re
+
+from django.urls import reverse
+from django.utils.html import escape, linebreaks
+
+# Меняется при любом изменении отрисовки: старые хэши перестают
+# совпадать, и render_texts перерисовывает все строки.
+MARKUP_VERSION = 2
+
+TOKEN_RE = re.compile(
+    r'(?P<url>https?://[^\s<>"\']+)'
+    r'|(?<![\w@])@(?P<mention>[\w.+-]*\w)'
+    r'|(?<![\w&#])#(?P<tag>\w+)'
+)
+URL_TRAILING = '.,;:!?)\'"'
+TAG_MAX_LENGTH = 150
+
+
+def text_hash(text):
+    """Хэш текста с учётом версии разметки."""
+    return hashlib.sha256(
+        f'{MARKUP_VERSION}:{text}'.encode('utf-8')
+    ).hexdigest()
+
+
+def _link(href, text, css_class=None):
+    css = f' class="{css_class}"' if css_class else ''
+    return f'<a href="{escape(href)}"{css}>{escape(text)}</a>'
+
+
+def _url(url):
+    stripped = url.rstrip(URL_TRAILING)
+    tail = url[len(stripped):]
+    link = f'<a href="{escape(stripped)}" rel="nofollow noopener">'
+    return f'{link}{escape(stripped)}</a>{escape(tail)}'
+
+
+def _token(match):
+    if match.group('url'):
+        return _url(match.group('url'))
+    if match.group('mention'):
+        username = match.group('mention')
+        return _link(
+            reverse('posts:profile', args=[username]),
+            f'@{username}', 'mention',
+        )
+    tag = match.group('tag')
+    return _link(
+        reverse('posts:tag_posts', args=[tag.casefold()]),
+        f'#{tag}', 'hashtag',
+    )
+
+
+def extract_tags(text):
+    """Хэштеги (в нижнем регистре) и упоминания текста: {'#тег', '@user'}."""
+    tags = set()
+    for match in TOKEN_RE.finditer(text):
+        if match.group('tag'):
+            tags.add(f'#{match.group("tag").casefold()}')
+        elif match.group('mention'):
+            tags.add(f'@{match.group("mention")}')
+    return {tag for tag in tags if len(tag) <= TAG_MAX_LENGTH + 1}
+
+
+def render(text):
+    """Безопасный HTML из текста: абзацы, ссылки, упоминания, хэштеги."""
+    parts = []
+    position = 0
+    for match in TOKEN_RE.finditer(text):
+        parts.append(escape(text[position:match.start()]))
+        parts.append(_token(match))
+        position = match.end()
+    parts.append(escape(text[position:]))
+    return linebreaks(''.join(parts))
@@ -0,0 +1,92 @@
+import gzip
+import hashlib
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+from .encoding import accepts_encoding
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/|application/(json|javascript|xml|atom\+xml|rss\+xml))'
+)
+
+
+def _gzip(content):
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+COMPRESSORS = {'gzip': _gzip}
+if brotli is not None:
+    COMPRESSORS['br'] = brotli.compress
+
+
+class CompressionMiddleware:
+    """Сжимает ответы gzip или brotli.
+
+    Маленькие (меньше COMPRESSION_MIN_LENGTH) и потоковые ответы не
+    сжимаются. Сжатые байты общих ответов кэшируются по хэшу
+    содержимого, поэтому одна и та же страница (например, из кэша
+    шаблона) не сжимается повторно на каждом запросе. Личные ответы
+    (с cookie, токеном CSRF, содержимым пользователя) каждый раз
+    уникальны: их копии только вытесняли бы из кэша лимиты и сессии,
+    поэтому они сжимаются без кэша.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        encoding = self.choose_encoding(request, response)
+        if encoding is None:
+            return response
+        content = response.content
+        if self.is_shared(request, response):
+            key = (f'compressed:{encoding}:'
+                   f'{hashlib.md5(content).hexdigest()}')
+            compressed = cache.get(key)
+            if compressed is None:
+                compressed = COMPRESSORS[encoding](content)
+                cache.set(key, compressed,
+                          settings.COMPRESSION_CACHE_TIMEOUT)
+        else:
+            compressed = COMPRESSORS[encoding](content)
+        if len(compressed) >= len(content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        if response.has_header('ETag'):
+            response['ETag'] = re.sub(r'^(W/)?', 'W/', response['ETag'])
+        return response
+
+    def is_shared(self, request, response):
+        """Ответ одинаков для всех анонимных клиентов без cookie."""
+        if response.cookies:
+            return False
+        vary = {header.strip().lower()
+                for header in response.get('Vary', '').split(',')}
+        return 'cookie' not in vary or not request.COOKIES
+
+    def choose_encoding(self, request, response):
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if (response.streaming
+                or response.has_header('Content-Encoding')
+                or len(response.content) < settings.COMPRESSION_MIN_LENGTH
+                or not COMPRESSIBLE_TYPES.match(
+                    response.get('Content-Type', ''))):
+            return None
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if settings.COMPRESSION_BROTLI and 'br' in COMPRESSORS and (
+                accepts_encoding(accepted, 'br')):
+            return 'br'
+        if accepts_encoding(accepted, 'gzip'):
+            return 'gzip'
+        return None
@@ -0,0 +1,42 @@
+import pickle
+
+from django.db import migrations, models
+
+
+def unpickle_messages(apps, schema_editor):
+    # Письма, поставленные в очередь до перехода на MIME.
+    OutboxMessage = apps.get_model('core', 'OutboxMessage')
+    for row in OutboxMessage.objects.all():
+        email_message = pickle.loads(bytes(row.message))
+        row.message = email_message.message().as_bytes()
+        row.from_email = email_message.from_email
+        row.recipients = '\n'.join(email_message.recipients())
+        row.save(update_fields=('message', 'from_email', 'recipients'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='from_email',
+            field=models.CharField(default='', max_length=254, verbose_name='Отправитель'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='recipients',
+            field=models.TextField(default='', verbose_name='Получатели'),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='outboxmessage',
+            name='message',
+            field=models.BinaryField(verbose_name='MIME-сообщение'),
+        ),
+        migrations.RunPython(unpickle_messages, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,7 @@
 from django.db import models
+from django.utils import timezone
+
+from .signals import soft_deleted
 
 
 class CreatedModel(models.Model):
@@ -10,3 +13,78 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def _delete_dependents(self):
+        # Зависимые строки с каскадным удалением помечаются раньше
+        # родителей: после UPDATE родители выпадут из подзапроса.
+        soft_deleted.send(sender=self.model, queryset=self)
+        for relation in self.model._meta.related_objects:
+            related = relation.related_model
+            if (relation.on_delete is models.CASCADE
+                    and issubclass(related, SoftDeleteModel)):
+                related.objects.filter(**{
+                    f'{relation.field.name}__in': self.values('pk')
+                }).delete()
+
+    def delete(self):
+        """Помечает строки и их каскадные зависимости удалёнными."""
+        self._delete_dependents()
+        return self.update(deleted=timezone.now())
+
+    def hard_delete(self):
+        return super().delete()
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Менеджер по умолчанию: удалённые строки не видны."""
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted__isnull=True)
+
+
+class SoftDeleteModel(models.Model):
+    """Абстрактная модель. Удаление только ставит отметку deleted.
+
+    Сами строки удаляет команда purge_deleted небольшими пачками.
+    Полный набор строк доступен через all_objects.
+    """
+    deleted = models.DateTimeField(
+        'Дата удаления',
+        blank=True,
+        null=True,
+        db_index=True,
+        editable=False
+    )
+
+    objects = SoftDeleteManager()
+    all_objects = models.Manager.from_queryset(SoftDeleteQuerySet)()
+
+    class Meta:
+        abstract = True
+
+    def delete(self, using=None, keep_parents=False):
+        type(self).objects.filter(pk=self.pk)._delete_dependents()
+        self.deleted = timezone.now()
+        self.save(using=using, update_fields=('deleted',))
+
+    def hard_delete(self, using=None, keep_parents=False):
+        return super().delete(using=using, keep_parents=keep_parents)
+
+
+class OutboxMessage(CreatedModel):
+    """Письмо в очереди на отправку (см. core.mail)."""
+    message = models.BinaryField('MIME-сообщение')
+    from_email = models.CharField('Отправитель', max_length=254)
+    # Адреса конверта (to, cc и bcc) по одному на строку.
+    recipients = models.TextField('Получатели')
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    next_attempt = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now,
+        db_index=True
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        ordering = ('pk',)
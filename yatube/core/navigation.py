@@ -0,0 +1,43 @@
+from functools import lru_cache
+
+from django.templatetags.static import static
+from django.urls import reverse
+
+# Пункты меню: (имя view, заголовок, для кого, доп. css-класс).
+# None — для всех, True — только вошедшим, False — только гостям.
+NAVIGATION = (
+    ('about:author', 'Об авторе', None, ''),
+    ('about:tech', 'Технологии', None, ''),
+    ('posts:post_create', 'Новая запись', True, ''),
+    ('notifications:index', 'Уведомления', True, ''),
+    ('password_change', 'Изменить пароль', True, 'link-light'),
+    ('users:logout', 'Выйти', True, 'link-light'),
+    ('users:login', 'Войти', False, 'link-light'),
+    ('users:signup', 'Регистрация', False, 'link-light'),
+)
+
+
+@lru_cache(maxsize=None)
+def static_url(path):
+    """URL статического файла, вычисляется один раз на процесс."""
+    return static(path)
+
+
+@lru_cache(maxsize=2)
+def nav_items(is_authenticated):
+    """Меню с готовыми адресами для гостя или вошедшего пользователя."""
+    return tuple(
+        {
+            'view_name': view_name,
+            'title': title,
+            'url': reverse(view_name),
+            'css': css,
+        }
+        for view_name, title, audience, css in NAVIGATION
+        if audience is None or audience == is_authenticated
+    )
+
+
+@lru_cache(maxsize=None)
+def home_url():
+    return reverse('posts:index')
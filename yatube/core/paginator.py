@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset):
+    """Примерное число строк таблицы без полного COUNT(*).
+
+    PostgreSQL хранит оценку в pg_class; в остальных БД берём
+    наибольший первичный ключ — это один проход по индексу.
+    """
+    model = queryset.model
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row else 0
+    return model._default_manager.aggregate(top=Max('pk'))['top'] or 0
+
+
+def _where_sql(queryset):
+    query = queryset.query
+    compiler = query.get_compiler(queryset.db)
+    return compiler.compile(query.where) if query.where else ('', [])
+
+
+def is_unfiltered(queryset):
+    """Нет условий, кроме тех, что добавляет менеджер по умолчанию.
+
+    Например, SoftDeleteManager всегда добавляет deleted IS NULL.
+    """
+    default = queryset.model._default_manager.all()
+    return _where_sql(queryset) == _where_sql(default)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор админки для больших таблиц.
+
+    Для списка без фильтров и поиска (кроме условий менеджера по
+    умолчанию) при оценке больше
+    ADMIN_ESTIMATED_COUNT_THRESHOLD отдаёт оценку вместо COUNT(*).
+    Отфильтрованные списки считаются точно.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if is_unfiltered(queryset):
+            estimate = estimate_count(queryset)
+            if estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Строки queryset модели sender сейчас будут помечены удалёнными.
+# Получатели убирают производные данные, которым не нужны скрытые строки.
+soft_deleted = Signal(providing_args=['queryset'])
@@ -0,0 +1,106 @@
+"""Раздача статики на уровне WSGI, до Django.
+
+Файлы из STATIC_ROOT отдаются без middleware, URL-резолвера и шаблонов.
+Файлы с хэшем в имени кэшируются браузером навсегда (immutable),
+заранее сжатые .br/.gz выбираются по Accept-Encoding.
+"""
+import json
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+from .encoding import accepts_encoding
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, max-age=60'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+CHUNK_SIZE = 64 * 1024
+
+
+class StaticFilesApp:
+    def __init__(self, application, root, prefix):
+        self.application = application
+        self.root = os.path.realpath(root)
+        self.prefix = prefix
+        self.hashed = self.load_hashed_names()
+
+    def load_hashed_names(self):
+        manifest = os.path.join(
+            self.root, ManifestStaticFilesStorage.manifest_name
+        )
+        try:
+            with open(manifest, encoding='utf-8') as f:
+                return set(json.load(f).get('paths', {}).values())
+        except (OSError, ValueError):
+            return set()
+
+    def find(self, name):
+        path = os.path.realpath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep):
+            return None
+        return path if os.path.isfile(path) else None
+
+    def __call__(self, environ, start_response):
+        path_info = environ.get('PATH_INFO', '')
+        method = environ.get('REQUEST_METHOD')
+        if (not path_info.startswith(self.prefix)
+                or method not in ('GET', 'HEAD')):
+            return self.application(environ, start_response)
+        name = path_info[len(self.prefix):]
+        path = self.find(name)
+        if path is None:
+            return self.application(environ, start_response)
+        return self.serve(environ, start_response, name, path)
+
+    def serve(self, environ, start_response, name, path):
+        content_type, _ = mimetypes.guess_type(name)
+        headers = [
+            ('Cache-Control',
+             IMMUTABLE if name in self.hashed else REVALIDATE),
+            ('Vary', 'Accept-Encoding'),
+        ]
+        accepted = environ.get('HTTP_ACCEPT_ENCODING', '')
+        for encoding, suffix in ENCODINGS:
+            if (accepts_encoding(accepted, encoding)
+                    and os.path.isfile(path + suffix)):
+                path += suffix
+                headers.append(('Content-Encoding', encoding))
+                break
+        stat = os.stat(path)
+        headers.append(('Last-Modified', formatdate(stat.st_mtime,
+                                                    usegmt=True)))
+        if not self.modified_since(environ, stat.st_mtime):
+            start_response('304 Not Modified', headers)
+            return []
+        headers += [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Content-Length', str(stat.st_size)),
+        ]
+        start_response('200 OK', headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        f = open(path, 'rb')
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if file_wrapper is not None:
+            return file_wrapper(f, CHUNK_SIZE)
+        return iter_file(f)
+
+    def modified_since(self, environ, mtime):
+        header = environ.get('HTTP_IF_MODIFIED_SINCE')
+        if not header:
+            return True
+        try:
+            return int(mtime) > parsedate_to_datetime(header).timestamp()
+        except (TypeError, ValueError):
+            return True
+
+
+def iter_file(f):
+    with f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,19 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from core import markup as renderer
+
+register = template.Library()
+
+
+@register.filter
+def markup(text):
+    return mark_safe(renderer.render(text))
+
+
+@register.filter
+def rendered(obj):
+    """Сохранённый HTML текста; ещё не отрисованный текст рисуется сразу."""
+    if obj.text_html:
+        return mark_safe(obj.text_html)
+    return markup(obj.text)
@@ -0,0 +1,82 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..mail import deliver
+from ..models import OutboxMessage
+
+User = get_user_model()
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError('SMTP недоступен')
+
+
+class UnreachableBackend(BaseEmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('SMTP не отвечает')
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.OutboxEmailBackend',
+    OUTBOX_DELIVERY_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class OutboxTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username='forgetful', email='me@example.com', password='pass'
+        )
+
+    def reset_password(self):
+        self.client.post(
+            reverse('users:password_reset_form'),
+            {'email': 'me@example.com'}
+        )
+
+    def test_password_reset_queued_then_sent(self):
+        """Письмо сброса пароля уходит воркером, а не в запросе"""
+        self.reset_password()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+        call_command('send_outbox', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['me@example.com'])
+        self.assertEqual(
+            mail.outbox[0].message()['To'], 'me@example.com'
+        )
+        self.assertIn(b'Content-Type', mail.outbox[0].message().as_bytes(
+            linesep='\r\n'
+        ))
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_failed_message_retried_later(self):
+        """Письмо с ошибкой остаётся в очереди и откладывается"""
+        self.reset_password()
+        with self.settings(
+            OUTBOX_DELIVERY_BACKEND='core.tests.test_mail.FailingBackend'
+        ):
+            self.assertEqual(deliver(), (0, 1))
+        row = OutboxMessage.objects.get()
+        self.assertEqual(row.attempts, 1)
+        self.assertIn('SMTP', row.last_error)
+        self.assertEqual(deliver(), (0, 0))
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_connection_failure_postpones_batch(self):
+        """Ошибка открытия соединения откладывает всю пачку"""
+        self.reset_password()
+        self.reset_password()
+        with self.settings(
+            OUTBOX_DELIVERY_BACKEND='core.tests.test_mail.UnreachableBackend'
+        ):
+            self.assertEqual(deliver(), (0, 2))
+        for row in OutboxMessage.objects.all():
+            self.assertEqual(row.attempts, 1)
+            self.assertIn('SMTP', row.last_error)
+        self.assertEqual(deliver(), (0, 0))
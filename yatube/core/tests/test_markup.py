@@ -0,0 +1,49 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from .. import markup
+
+
+class RenderTests(SimpleTestCase):
+    def test_user_html_escaped(self):
+        """Теги из текста пользователя экранируются"""
+        html = markup.render('<script>alert(1)</script> "x"')
+        self.assertNotIn('<script>', html)
+        self.assertIn('&lt;script&gt;', html)
+
+    def test_links_mentions_hashtags(self):
+        """Ссылки, упоминания и хэштеги превращаются в разметку"""
+        html = markup.render(
+            'См. https://example.com/a?b=1&c=2. @leo #новости'
+        )
+        self.assertIn(
+            '<a href="https://example.com/a?b=1&amp;c=2" '
+            'rel="nofollow noopener">', html
+        )
+        self.assertIn('</a>. ', html)
+        self.assertIn(
+            f'<a href="{reverse("posts:profile", args=["leo"])}" '
+            'class="mention">@leo</a>', html
+        )
+        self.assertIn(
+            f'<a href="{reverse("posts:tag_posts", args=["новости"])}" '
+            'class="hashtag">#новости</a>', html
+        )
+
+    def test_no_markup_inside_words(self):
+        """Почта и якоря в словах не считаются упоминаниями и тегами"""
+        html = markup.render('mail@example.com a#b')
+        self.assertNotIn('<a', html)
+        self.assertNotIn('hashtag', html)
+
+    def test_extract_tags(self):
+        """Теги приводятся к нижнему регистру, ссылки тегами не считаются"""
+        self.assertEqual(
+            markup.extract_tags('#Django и @Leo, https://x.org/#frag'),
+            {'#django', '@Leo'}
+        )
+
+    def test_paragraphs(self):
+        self.assertEqual(
+            markup.render('a\n\nb\nc'), '<p>a</p>\n\n<p>b<br>c</p>'
+        )
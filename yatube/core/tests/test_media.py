@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+from http import HTTPStatus
+
+from django.test import TestCase, override_settings
+
+MEDIA_ROOT = tempfile.mkdtemp()
+CONTENT = bytes(range(256)) * 4
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_SENDFILE_BACKEND=None)
+class MediaViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(MEDIA_ROOT, 'posts'), exist_ok=True)
+        with open(os.path.join(MEDIA_ROOT, 'posts', 'pic.gif'), 'wb') as f:
+            f.write(CONTENT)
+        with open(os.path.join(MEDIA_ROOT, 'posts', 'кот.gif'), 'wb') as f:
+            f.write(CONTENT)
+        with open(os.path.join(MEDIA_ROOT, 'secret.txt'), 'wb') as f:
+            f.write(b'secret')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_full_file(self):
+        """Файл отдаётся целиком с валидаторами кэша"""
+        response = self.client.get('/media/posts/pic.gif')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Content-Type'], 'image/gif')
+        response = self.client.get(
+            '/media/posts/pic.gif', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_range(self):
+        """Range отдаёт только запрошенные байты"""
+        response = self.client.get(
+            '/media/posts/pic.gif', HTTP_RANGE='bytes=10-19'
+        )
+        self.assertEqual(response.status_code, HTTPStatus.PARTIAL_CONTENT)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[10:20])
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        response = self.client.get(
+            '/media/posts/pic.gif', HTTP_RANGE='bytes=5000-'
+        )
+        self.assertEqual(
+            response.status_code, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+
+    def test_private_files_not_served(self):
+        """Файлы вне публичных каталогов недоступны"""
+        for path in ('/media/secret.txt', '/media/posts/../secret.txt'):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    @override_settings(MEDIA_SENDFILE_BACKEND='x-accel')
+    def test_accel_redirect(self):
+        """Передача файла поручается nginx"""
+        response = self.client.get('/media/posts/pic.gif')
+        self.assertEqual(
+            response['X-Accel-Redirect'], '/protected-media/posts/pic.gif'
+        )
+        self.assertEqual(response.content, b'')
+        response = self.client.get('/media/posts/кот.gif')
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            '/protected-media/posts/%D0%BA%D0%BE%D1%82.gif',
+        )
@@ -0,0 +1,58 @@
+import gzip
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import middleware
+
+User = get_user_model()
+
+
+@override_settings(COMPRESSION_BROTLI=False)
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_large_page_compressed_once(self):
+        """Страница сжимается один раз, дальше сжатие берётся из кэша"""
+        url = reverse('about:author')
+        with mock.patch.dict(
+            middleware.COMPRESSORS, gzip=mock.Mock(wraps=middleware._gzip)
+        ):
+            first = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(middleware.COMPRESSORS['gzip'].call_count, 1)
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        self.assertEqual(first.content, second.content)
+        self.assertIn('Accept-Encoding', first['Vary'])
+        self.assertIn(b'<html', gzip.decompress(first.content))
+
+    def test_personal_page_compressed_without_cache(self):
+        """Страницы для пользователя с cookie сжимаются, но не кэшируются"""
+        user = User.objects.create_user(username='reader')
+        self.client.force_login(user)
+        url = reverse('about:author')
+        with mock.patch.dict(
+            middleware.COMPRESSORS, gzip=mock.Mock(wraps=middleware._gzip)
+        ):
+            for _ in range(2):
+                response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+                self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(middleware.COMPRESSORS['gzip'].call_count, 2)
+
+    def test_small_and_unaccepted_responses_not_compressed(self):
+        """Маленькие ответы и клиенты без gzip получают ответ как есть"""
+        response = self.client.get(
+            reverse('api:follow_list'), HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.client.get(reverse('about:author'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.client.get(
+            reverse('about:author'),
+            HTTP_ACCEPT_ENCODING='identity, gzip;q=0',
+        )
+        self.assertFalse(response.has_header('Content-Encoding'))
@@ -0,0 +1,93 @@
+import re
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from ..context_processors import year
+
+User = get_user_model()
+
+LINK = re.compile(r'class="nav-link ([^"]*)"\s*href="([^"]*)"\s*>([^<]*)')
+
+
+class HeaderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader')
+
+    def links(self, url):
+        """Пункты меню шапки: заголовок -> (адрес, css-классы)"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return {
+            title.strip(): (href, classes.split())
+            for classes, href, title in LINK.findall(response.content.decode())
+        }
+
+    def test_guest_items(self):
+        """Гость видит вход и регистрацию, но не пункты для вошедших"""
+        links = self.links(reverse('about:author'))
+        self.assertEqual(
+            list(links), ['Об авторе', 'Технологии', 'Войти', 'Регистрация']
+        )
+        self.assertEqual(links['Войти'][0], reverse('users:login'))
+        self.assertEqual(links['Регистрация'][0], reverse('users:signup'))
+
+    def test_user_items(self):
+        """Вошедший пользователь видит свои пункты и ссылку смены пароля"""
+        self.client.force_login(self.user)
+        links = self.links(reverse('about:author'))
+        self.assertEqual(list(links), [
+            'Об авторе', 'Технологии', 'Новая запись', 'Уведомления',
+            'Изменить пароль', 'Выйти',
+        ])
+        self.assertEqual(
+            links['Изменить пароль'],
+            (reverse('password_change'), ['link-light']),
+        )
+        self.assertEqual(links['Выйти'][0], reverse('users:logout'))
+
+    def test_active_item(self):
+        """Активным отмечен только пункт текущей страницы"""
+        for url, title in (
+            (reverse('about:author'), 'Об авторе'),
+            (reverse('about:tech'), 'Технологии'),
+            (reverse('users:login'), 'Войти'),
+        ):
+            with self.subTest(url=url):
+                active = [
+                    name for name, (_, classes) in self.links(url).items()
+                    if 'active' in classes
+                ]
+                self.assertEqual(active, [title])
+
+    def test_no_active_item(self):
+        """На странице вне меню ни один пункт не активен"""
+        links = self.links(reverse('posts:index'))
+        self.assertFalse(
+            any('active' in classes for _, classes in links.values())
+        )
+
+
+class YearTests(SimpleTestCase):
+    def setUp(self):
+        for name, value in (('_year', None), ('_next_year_at', float('-inf'))):
+            patcher = mock.patch.object(year, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_year_recomputed_after_boundary(self):
+        """Год пересчитывается только после начала следующего года"""
+        with mock.patch.object(year, 'datetime', wraps=year.datetime) as dt:
+            dt.now.return_value.year = 2025
+            self.assertEqual(year.current_year(), 2025)
+            boundary = year._next_year_at
+            dt.now.return_value.year = 2026
+            with mock.patch('time.time', return_value=boundary - 1):
+                self.assertEqual(year.current_year(), 2025)
+            with mock.patch('time.time', return_value=boundary):
+                self.assertEqual(year.current_year(), 2026)
+        self.assertEqual(dt.now.call_count, 2)
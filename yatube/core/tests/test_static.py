@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.test.client import RequestFactory
+
+from ..static_app import IMMUTABLE, StaticFilesApp
+
+
+class StaticFilesTests(SimpleTestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.source, 'css'))
+        with open(os.path.join(self.source, 'css', 'site.css'), 'w') as f:
+            f.write('body { color: red; }\n' * 100)
+        self.settings_override = override_settings(
+            STATICFILES_DIRS=[self.source], STATIC_ROOT=self.root
+        )
+        self.settings_override.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.source, ignore_errors=True)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def serve(self, url, **headers):
+        app = StaticFilesApp(None, self.root, settings.STATIC_URL)
+        environ = RequestFactory().get(url, **headers).environ
+        result = {}
+
+        def start_response(status, response_headers):
+            result['status'] = status
+            result['headers'] = dict(response_headers)
+
+        body = b''.join(app(environ, start_response))
+        return result['status'], result['headers'], body
+
+    def test_hashed_file_is_immutable_and_compressed(self):
+        """Хэшированный файл отдаётся сжатым и кэшируется навсегда"""
+        url = staticfiles_storage.url('css/site.css')
+        self.assertNotEqual(url, settings.STATIC_URL + 'css/site.css')
+        status, headers, body = self.serve(
+            url, HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(headers['Cache-Control'], IMMUTABLE)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(int(headers['Content-Length']), len(body))
+
+    def test_refused_encoding_not_served(self):
+        """Кодировка с q=0 не выбирается"""
+        url = staticfiles_storage.url('css/site.css')
+        status, headers, body = self.serve(
+            url, HTTP_ACCEPT_ENCODING='identity, gzip;q=0, br;q=0'
+        )
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertIn(b'color: red', body)
+
+    def test_path_outside_root_is_not_served(self):
+        """Пути вне STATIC_ROOT передаются дальше приложению"""
+        app = StaticFilesApp(lambda environ, start: 'app', self.root, '/s/')
+        environ = RequestFactory().get('/s/../../etc/passwd').environ
+        self.assertEqual(app(environ, None), 'app')
@@ -0,0 +1,81 @@
+import copy
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.template import TemplateSyntaxError, engines
+from django.test import SimpleTestCase, override_settings
+
+from ..warmup import iter_template_names, reset_templates, warm_templates
+
+
+class WarmTemplatesTests(SimpleTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.write('base.html', '<title>{% block title %}{% endblock %}')
+        self.write('posts/index.html', '{% extends "base.html" %}')
+        self.write('notifications/digest.txt', '{{ count }} новых')
+        templates = copy.deepcopy(settings.TEMPLATES)
+        templates[0]['DIRS'] = [self.dir]
+        self.settings_override = override_settings(TEMPLATES=templates)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def cached_names(self):
+        loader = engines['django'].engine.template_loaders[0]
+        return {
+            key for key, value in loader.get_template_cache.items()
+            if not isinstance(value, type)
+        }
+
+    def test_only_html_names(self):
+        """В список попадают только .html, включая вложенные каталоги"""
+        names = iter_template_names(engines['django'].engine)
+        self.assertCountEqual(names, ['base.html', 'posts/index.html'])
+
+    def test_warm_fills_cache(self):
+        """warm_templates заполняет кэш загрузчика и пропускает .txt"""
+        self.assertEqual(warm_templates(), 2)
+        self.assertEqual(
+            self.cached_names(), {'base.html', 'posts/index.html'}
+        )
+
+    def test_reset_clears_cache(self):
+        """reset_templates очищает кэш после прогрева"""
+        warm_templates()
+        reset_templates()
+        self.assertEqual(self.cached_names(), set())
+
+    def test_broken_template_raises(self):
+        """Ошибка в шаблоне всплывает при прогреве"""
+        self.write('broken.html', '{% if %}')
+        with self.assertRaises(TemplateSyntaxError):
+            warm_templates()
+
+    def test_precompile_command(self):
+        """Команда сообщает число разобранных шаблонов"""
+        out = StringIO()
+        call_command('precompile_templates', stdout=out)
+        self.assertIn('Шаблонов разобрано: 2 за ', out.getvalue())
+        self.assertIn('posts/index.html', self.cached_names())
+
+    def test_project_templates(self):
+        """Шаблоны проекта без digest.txt, но с base.html"""
+        self.settings_override.disable()
+        try:
+            names = set(iter_template_names(engines['django'].engine))
+        finally:
+            self.settings_override.enable()
+        self.assertIn('base.html', names)
+        self.assertIn('includes/header.html', names)
+        self.assertNotIn('notifications/digest.txt', names)
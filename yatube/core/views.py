@@ -1,4 +1,18 @@
+import mimetypes
+import os
+from urllib.parse import quote
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+from .media import FileRange, RangeNotSatisfiable, parse_range
 
 
 def page_not_found(request, exception):
@@ -14,4 +28,95 @@ def permission_denied(request, exception):
 
 
 def csrf_failure(request, reason=''):
-    return render(request, 'core/403csrf.html')
+    if request.path.startswith('/api/'):
+        # Клиенты API разбирают JSON, а не HTML-страницу ошибки.
+        return JsonResponse(
+            {'detail': f'Ошибка CSRF: {reason}'}, status=HTTPStatus.FORBIDDEN
+        )
+    return render(request, 'core/403csrf.html', status=HTTPStatus.FORBIDDEN)
+
+
+def media_path(path):
+    """Абсолютный путь к публичному файлу из MEDIA_ROOT или 404."""
+    if not path.startswith(settings.MEDIA_PUBLIC_PREFIXES):
+        raise Http404
+    if any(part.startswith('.') for part in path.split('/')):
+        raise Http404
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    return full_path
+
+
+@require_safe
+def media(request, path):
+    """Отдаёт загруженные файлы.
+
+    После проверки доступа передачу байтов можно поручить фронтенд-серверу
+    (X-Accel-Redirect для nginx, X-Sendfile для Apache/lighttpd). Без него
+    файл отдаёт FileResponse, который сервер передаёт через sendfile;
+    поддерживаются Range и условные запросы.
+    """
+    full_path = media_path(path)
+    stat = os.stat(full_path)
+    etag = quote_etag(f'{int(stat.st_mtime):x}-{stat.st_size:x}')
+    last_modified = http_date(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is not None:
+        return response
+    content_type, _ = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    if backend == 'x-accel':
+        response = HttpResponse(content_type=content_type)
+        # Заголовок только ASCII: старые загрузки хранятся под исходными
+        # (например, кириллическими) именами, nginx раскодирует URI сам.
+        response['X-Accel-Redirect'] = quote(
+            settings.MEDIA_ACCEL_PREFIX + path
+        )
+    elif backend == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = full_path
+    else:
+        response = file_response(request, full_path, stat.st_size,
+                                 content_type, (etag, last_modified))
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    patch_cache_control(
+        response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE
+    )
+    return response
+
+
+def file_response(request, full_path, size, content_type, validators):
+    byte_range = None
+    if request.META.get('HTTP_IF_RANGE', validators[0]) in validators:
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(
+                status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+            )
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, length = byte_range
+        response = FileResponse(
+            FileRange(file, start, length),
+            content_type=content_type,
+            status=HTTPStatus.PARTIAL_CONTENT,
+        )
+        response['Content-Length'] = length
+        response['Content-Range'] = (
+            f'bytes {start}-{start + length - 1}/{size}'
+        )
+    response['Accept-Ranges'] = 'bytes'
+    return response
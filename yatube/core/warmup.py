@@ -0,0 +1,43 @@
+import os
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+
+
+def iter_template_names(engine):
+    """Имена всех шаблонов из каталогов DIRS движка."""
+    for template_dir in engine.dirs:
+        for root, _, files in os.walk(template_dir):
+            for filename in files:
+                if filename.endswith('.html'):
+                    path = os.path.relpath(
+                        os.path.join(root, filename), template_dir
+                    )
+                    yield path.replace(os.sep, '/')
+
+
+def warm_templates():
+    """Разбирает шаблоны проекта заранее, заполняя кэш загрузчика.
+
+    Вызывается при старте процесса, чтобы первый запрос к каждому
+    воркеру не платил за разбор base.html и его включений.
+    Возвращает число загруженных шаблонов.
+    """
+    count = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in iter_template_names(backend.engine):
+            backend.engine.get_template(name)
+            count += 1
+    return count
+
+
+def reset_templates():
+    """Очищает кэш шаблонов (нужно бенчмаркам для холодного старта)."""
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for loader in backend.engine.template_loaders:
+            if hasattr(loader, 'reset'):
+                loader.reset()
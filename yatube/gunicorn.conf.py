@@ -0,0 +1,18 @@
+# Профиль развёртывания для gunicorn:
+#   gunicorn -c gunicorn.conf.py yatube.wsgi
+# Воркеры gthread обслуживают несколько запросов одновременно:
+# пока один поток ждёт БД или диск, остальные продолжают работу.
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+timeout = 30
+keepalive = 5
+# Шаблоны прогреваются в yatube.wsgi до форка воркеров.
+preload_app = True
+# Gunicorn слушает только 127.0.0.1 за nginx, который дописывает
+# $remote_addr в X-Forwarded-For: лимиты по IP берут адрес оттуда.
+os.environ.setdefault('TRUSTED_PROXY_COUNT', '1')
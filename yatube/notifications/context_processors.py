@@ -0,0 +1,8 @@
+from .inbox import unread_count
+
+
+def unread(request):
+    """Число непрочитанных уведомлений для шапки сайта."""
+    if not request.user.is_authenticated:
+        return {}
+    return {'unread_notifications': unread_count(request.user)}
@@ -0,0 +1,58 @@
+"""Письма-сводки с уведомлениями.
+
+Вместо письма на каждое событие send_digests раз в интервал собирает
+все неотправленные и непрочитанные уведомления и шлёт каждому
+получателю одно письмо через EMAIL_BACKEND, открывая одно соединение на
+пачку писем.
+"""
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+
+from .models import Notification
+
+
+def _message(user, notifications):
+    body = render_to_string('notifications/digest.txt', {
+        'user': user,
+        'notifications': notifications,
+        'site_url': settings.SITE_URL,
+    })
+    return EmailMessage(
+        f'Yatube: новых уведомлений — {len(notifications)}',
+        body,
+        to=[user.email],
+    )
+
+
+def send_digests(batch_size=100):
+    """Отправляет сводки; возвращает число писем."""
+    pending = Notification.objects.filter(emailed=False, read=False)
+    sent = 0
+    while True:
+        recipients = list(
+            pending.order_by('recipient').values_list(
+                'recipient', flat=True
+            ).distinct()[:batch_size]
+        )
+        if not recipients:
+            return sent
+        notifications = list(
+            pending.filter(recipient__in=recipients)
+            .select_related('recipient', 'actor')
+            .order_by('recipient', 'created')
+        )
+        messages = [
+            _message(user, list(group))
+            for user, group in groupby(
+                notifications, key=lambda item: item.recipient
+            )
+            if user.email
+        ]
+        with get_connection() as connection:
+            sent += connection.send_messages(messages) or 0
+        Notification.objects.filter(
+            pk__in=[notification.pk for notification in notifications]
+        ).update(emailed=True)
@@ -0,0 +1,76 @@
+"""Запись уведомлений и счётчик непрочитанных.
+
+Уведомления для всех получателей события вставляются одним bulk_create.
+Число непрочитанных хранится в кэше: новые уведомления прибавляются к
+нему incr, а чтение ленты обнуляет, так что COUNT(*) по индексу
+(recipient, read) выполняется только при пустом кэше.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+from posts.models import Post
+from .models import Notification
+
+
+def unread_key(user_id):
+    return f'notifications_unread:{user_id}'
+
+
+def notify(kind, actor, recipient_ids, post=None):
+    """Создаёт уведомления всем получателям, кроме самого автора события."""
+    notifications = [
+        Notification(
+            kind=kind, actor=actor, recipient_id=recipient_id, post=post
+        )
+        for recipient_id in set(recipient_ids) - {actor.pk}
+    ]
+    bulk_notify(notifications)
+
+
+def comments_posted(comments):
+    """Уведомляет авторов записей о новых комментариях."""
+    post_authors = dict(Post.objects.filter(
+        pk__in={comment.post_id for comment in comments}
+    ).values_list('pk', 'author_id'))
+    bulk_notify([
+        Notification(
+            kind=Notification.COMMENT,
+            actor_id=comment.author_id,
+            recipient_id=post_authors[comment.post_id],
+            post_id=comment.post_id,
+        )
+        for comment in comments
+        if comment.post_id in post_authors
+        and post_authors[comment.post_id] != comment.author_id
+    ])
+
+
+def bulk_notify(notifications):
+    """Сохраняет готовые уведомления и сдвигает счётчики получателей."""
+    if not notifications:
+        return
+    Notification.objects.bulk_create(notifications)
+    for recipient_id, count in Counter(
+        notification.recipient_id for notification in notifications
+    ).items():
+        try:
+            cache.incr(unread_key(recipient_id), count)
+        except ValueError:
+            # Счётчика в кэше нет: его посчитает unread_count.
+            pass
+
+
+def unread_count(user):
+    key = unread_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = user.notifications.filter(read=False).count()
+        cache.add(key, count, settings.NOTIFICATION_COUNT_TIMEOUT)
+    return count
+
+
+def mark_read(user):
+    user.notifications.filter(read=False).update(read=True)
+    cache.set(unread_key(user.pk), 0, settings.NOTIFICATION_COUNT_TIMEOUT)
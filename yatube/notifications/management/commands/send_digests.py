@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications import digest
+
+
+class Command(BaseCommand):
+    help = 'Отправляет пользователям письма-сводки с уведомлениями.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float,
+            default=settings.NOTIFICATION_DIGEST_INTERVAL,
+            help='Повторять отправку каждые N секунд.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Отправить сводки один раз и выйти (для cron).',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = digest.send_digests()
+            if sent:
+                self.stdout.write(f'Отправлено писем: {sent}')
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+from core.models import CreatedModel
+from posts.models import Post
+
+User = get_user_model()
+
+
+class Notification(CreatedModel):
+    COMMENT = 'comment'
+    FOLLOW = 'follow'
+    MENTION = 'mention'
+    KINDS = (
+        (COMMENT, 'Комментарий к записи'),
+        (FOLLOW, 'Новый подписчик'),
+        (MENTION, 'Упоминание'),
+    )
+
+    recipient = models.ForeignKey(User,
+                                  on_delete=models.CASCADE,
+                                  related_name='notifications')
+    actor = models.ForeignKey(User,
+                              on_delete=models.CASCADE,
+                              related_name='+')
+    kind = models.CharField('Тип', max_length=16, choices=KINDS)
+    post = models.ForeignKey(Post,
+                             blank=True,
+                             null=True,
+                             on_delete=models.SET_NULL,
+                             related_name='notifications')
+    read = models.BooleanField('Прочитано', default=False)
+    emailed = models.BooleanField('Отправлено письмом', default=False)
+
+    class Meta:
+        ordering = ('-created',)
+        indexes = [
+            models.Index(fields=('recipient', 'read'),
+                         name='notification_unread_idx'),
+            models.Index(fields=('emailed', 'read'),
+                         name='notification_digest_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()}: {self.actor}'
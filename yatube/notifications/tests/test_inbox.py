@@ -0,0 +1,90 @@
+from io import StringIO
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, User
+from posts.moderation import erase_posts
+from ..inbox import unread_count
+from ..models import Notification
+
+
+class NotificationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author', email='author@example.com'
+        )
+        self.reader = User.objects.create_user(username='reader')
+        self.post = Post.objects.create(author=self.author, text='Запись')
+        self.client_reader = Client()
+        self.client_reader.force_login(self.reader)
+        self.client_author = Client()
+        self.client_author.force_login(self.author)
+
+    def kinds(self, user):
+        return list(user.notifications.values_list('kind', flat=True))
+
+    def test_comment_follow_and_mention_notify(self):
+        """Комментарий, подписка и упоминание создают уведомления"""
+        self.assertEqual(unread_count(self.author), 0)
+        self.client_reader.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Отлично'}
+        )
+        self.client_reader.post(
+            reverse('posts:profile_follow', args=['author'])
+        )
+        Post.objects.create(author=self.reader, text='Привет, @author')
+        self.assertCountEqual(
+            self.kinds(self.author),
+            [Notification.COMMENT, Notification.FOLLOW, Notification.MENTION]
+        )
+        self.assertEqual(unread_count(self.author), 3)
+
+    def test_no_self_notifications(self):
+        """Свои действия не создают уведомлений"""
+        self.client_author.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Сам себе'}
+        )
+        Post.objects.create(author=self.author, text='Я — @author')
+        self.assertEqual(self.kinds(self.author), [])
+
+    def test_erased_post_keeps_notifications(self):
+        """Стёртая запись не уносит уведомления, счётчик совпадает"""
+        self.client_reader.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Отлично'}
+        )
+        self.assertEqual(unread_count(self.author), 1)
+        erase_posts(Post.objects.filter(pk=self.post.pk))
+        notification = self.author.notifications.get()
+        self.assertIsNone(notification.post)
+        self.assertEqual(unread_count(self.author), 1)
+        response = self.client_author.get(reverse('notifications:index'))
+        self.assertContains(response, 'reader')
+
+    def test_inbox_marks_read(self):
+        """Открытая лента уведомлений обнуляет счётчик"""
+        Post.objects.create(author=self.reader, text='@author, смотри')
+        response = self.client_author.get(reverse('posts:index'))
+        self.assertEqual(response.context['unread_notifications'], 1)
+        response = self.client_author.get(reverse('notifications:index'))
+        self.assertContains(response, 'смотри')
+        self.assertEqual(unread_count(self.author), 0)
+        self.assertFalse(self.author.notifications.filter(read=False).exists())
+
+    def test_digest_one_email_per_user(self):
+        """Сводка собирает все уведомления в одно письмо"""
+        for i in range(3):
+            Post.objects.create(author=self.reader, text=f'@author {i}')
+        call_command('send_digests', once=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['author@example.com'])
+        self.assertEqual(mail.outbox[0].body.count('упоминание'), 3)
+        call_command('send_digests', once=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
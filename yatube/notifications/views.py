@@ -0,0 +1,21 @@
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.shortcuts import render
+
+from .inbox import mark_read
+
+NOTIFICATIONS_PER_PAGE = 20
+
+
+@login_required
+def index(request):
+    """Лента уведомлений; открытие ленты отмечает их прочитанными."""
+    notifications = request.user.notifications.select_related(
+        'actor', 'post'
+    ).defer('post__text', 'post__text_html')
+    page_obj = Paginator(notifications, NOTIFICATIONS_PER_PAGE).get_page(
+        request.GET.get('page')
+    )
+    page_obj.object_list = list(page_obj.object_list)
+    mark_read(request.user)
+    return render(request, 'notifications/index.html', {'page_obj': page_obj})
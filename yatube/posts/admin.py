@@ -1,14 +1,87 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
 
+from core.paginator import EstimatedCountPaginator
+from . import moderation
 from .models import Post, Group, Comment, Follow
 
 
+class PostActionForm(ActionForm):
+    group = forms.ModelChoiceField(
+        Group.objects.all(), required=False, label='Группа'
+    )
+    ungroup = forms.BooleanField(required=False, label='Без группы')
+
+
+class CommentActionForm(ActionForm):
+    date_from = forms.DateField(required=False, label='С')
+    date_to = forms.DateField(required=False, label='По')
+
+
+def bound_action_form(modeladmin, request):
+    """Форма действия с данными запроса, как её проверяет админка."""
+    form = modeladmin.action_form(request.POST)
+    form.fields['action'].choices = modeladmin.get_action_choices(request)
+    return form
+
+
+def delete_authors_content(modeladmin, request, queryset):
+    authors = set(queryset.values_list('author_id', flat=True))
+    posts, comments = moderation.delete_authors_content(authors)
+    modeladmin.message_user(
+        request,
+        f'Удалено записей: {posts}, комментариев: {comments}.'
+    )
+
+
+delete_authors_content.short_description = (
+    'Удалить все записи и комментарии выбранных авторов'
+)
+
+
 class PostAdmin(admin.ModelAdmin):
     list_display = ('pk', 'text', 'created', 'author', 'group')
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('created',)
+    date_hierarchy = 'created'
+    autocomplete_fields = ('author',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
+    action_form = PostActionForm
+    actions = (delete_authors_content, 'move_to_group')
+
+    def move_to_group(self, request, queryset):
+        form = bound_action_form(self, request)
+        if not form.is_valid():
+            self.message_user(request, 'Неверная группа.', messages.ERROR)
+            return
+        group = form.cleaned_data['group']
+        if (group is None) == (not form.cleaned_data['ungroup']):
+            self.message_user(
+                request,
+                'Выберите группу или отметьте «Без группы».',
+                messages.ERROR,
+            )
+            return
+        moved = moderation.move_posts(queryset, group)
+        self.message_user(
+            request,
+            f'Перенесено записей: {moved} в группу «{group or "без группы"}».'
+        )
+
+    move_to_group.short_description = 'Перенести выбранные записи в группу'
+
+    def get_changelist_formset(self, request, **kwargs):
+        formset = super().get_changelist_formset(request, **kwargs)
+        # Список групп запрашивается один раз на страницу,
+        # а не в каждой строке с редактируемой группой.
+        group = formset.form.base_fields['group']
+        group.choices = list(group.choices)
+        return formset
 
 
 class GroupAdmin(admin.ModelAdmin):
@@ -20,8 +93,45 @@ class GroupAdmin(admin.ModelAdmin):
 
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('post', 'author', 'text', 'created')
+    list_select_related = ('post', 'author')
     search_fields = ('text',)
     list_filter = ('created',)
+    date_hierarchy = 'created'
+    raw_id_fields = ('post', 'author')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    action_form = CommentActionForm
+    actions = (delete_authors_content, 'purge_date_range')
+
+    def purge_date_range(self, request, queryset):
+        form = bound_action_form(self, request)
+        if not form.is_valid():
+            self.message_user(request, 'Неверные даты.', messages.ERROR)
+            return
+        date_from = form.cleaned_data['date_from']
+        date_to = form.cleaned_data['date_to']
+        if date_from is None and date_to is None:
+            # Без дат действие касается только отмеченных строк,
+            # а не всего промежутка между ними.
+            purged = queryset.delete()
+            self.message_user(
+                request, f'Удалено выбранных комментариев: {purged}.'
+            )
+            return
+        if date_from is None or date_to is None or date_from > date_to:
+            self.message_user(
+                request, 'Укажите обе даты периода.', messages.ERROR
+            )
+            return
+        purged = moderation.purge_comments(date_from, date_to)
+        self.message_user(
+            request,
+            f'Удалено комментариев с {date_from} по {date_to}: {purged}.'
+        )
+
+    purge_date_range.short_description = (
+        'Удалить комментарии за период (без дат — только выбранные)'
+    )
 
 
 admin.site.register(Post, PostAdmin)
@@ -0,0 +1,144 @@
+"""Архив старых записей.
+
+Команда archive_posts переносит записи старше settings.POST_ARCHIVE_AFTER
+дней вместе с комментариями в таблицы ArchivedPost и ArchivedComment.
+Горячая таблица Post и её индексы остаются маленькими, а ленты читают
+архив, только когда страница выходит за последнюю горячую запись: все
+архивные записи старше горячих, поэтому порядок -created сохраняется
+простой склейкой двух выборок. Размер архива для ленты берётся из
+денормализованных счётчиков ArchiveCount.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.http import Http404
+
+from . import tags
+from .models import (
+    ArchiveCount, ArchivedComment, ArchivedPost, ArchivedPostTag, Comment,
+    Post, PostTag
+)
+from .moderation import erase_posts
+
+
+class ChainedPosts:
+    """Горячая выборка, за которой следует архивная.
+
+    Реализует count() и срезы, поэтому подходит для Paginator. Архив
+    запрашивается, только если срез заходит за конец горячей выборки.
+    Если размеры выборок уже известны (counts), COUNT(*) не выполняется.
+    """
+
+    def __init__(self, hot, archived, counts=None):
+        self.hot = hot
+        self.archived = archived
+        self._hot_count, self._archived_count = counts or (None, None)
+
+    @property
+    def hot_count(self):
+        if self._hot_count is None:
+            self._hot_count = self.hot.count()
+        return self._hot_count
+
+    def count(self):
+        if self._archived_count is None:
+            self._archived_count = self.archived.count()
+        return self.hot_count + self._archived_count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        if stop is not None and stop <= self.hot_count:
+            return list(self.hot[start:stop])
+        posts = list(self.hot[start:]) if start < self.hot_count else []
+        archived_start = max(start - self.hot_count, 0)
+        archived_stop = None if stop is None else stop - self.hot_count
+        return posts + list(self.archived[archived_start:archived_stop])
+
+
+def listing(hot, archived, counts=None):
+    """Лента записей: без полного текста, с авторами и группами."""
+    return ChainedPosts(*(
+        posts.select_related('author', 'group').defer('text', 'text_html')
+        for posts in (hot, archived)
+    ), counts=counts)
+
+
+def archived_count(scopes):
+    """Сколько архивных записей в областях scopes (см. ArchiveCount)."""
+    return ArchiveCount.objects.filter(scope__in=scopes).aggregate(
+        total=Sum('count')
+    )['total'] or 0
+
+
+def _count_archived(posts):
+    counts = Counter()
+    for author_id, group_id in posts.values_list('author_id', 'group_id'):
+        counts['index'] += 1
+        counts[f'author:{author_id}'] += 1
+        if group_id:
+            counts[f'group:{group_id}'] += 1
+    ArchiveCount.objects.bulk_create(
+        [ArchiveCount(scope=scope) for scope in counts],
+        ignore_conflicts=True,
+    )
+    for scope, count in counts.items():
+        ArchiveCount.objects.filter(scope=scope).update(
+            count=F('count') + count
+        )
+
+
+def get_post_or_404(post_id):
+    """Запись из горячей таблицы, а если её там нет — из архива."""
+    post = Post.objects.select_related('author', 'group').filter(
+        pk=post_id
+    ).first()
+    if post is None:
+        post = ArchivedPost.objects.select_related('author', 'group').filter(
+            pk=post_id
+        ).first()
+    if post is None:
+        raise Http404
+    return post
+
+
+def _copy(source, target):
+    """Копирует строки source в модель target одним INSERT на пачку."""
+    names = [field.attname for field in target._meta.concrete_fields]
+    target.objects.bulk_create(
+        target(**row) for row in source.values(*names)
+    )
+
+
+def _archive_batch(before, batch_size):
+    pks = list(
+        Post.objects.filter(created__lt=before)
+        .order_by('created').values_list('pk', flat=True)[:batch_size]
+    )
+    if not pks:
+        return 0
+    with transaction.atomic():
+        _copy(Post.objects.filter(pk__in=pks), ArchivedPost)
+        _copy(Comment.objects.filter(post__in=pks), ArchivedComment)
+        _copy(PostTag.objects.filter(post__in=pks), ArchivedPostTag)
+        tags.archive(pks)
+        _count_archived(Post.objects.filter(pk__in=pks))
+        return erase_posts(Post.all_objects.filter(pk__in=pks))
+
+
+def archive_posts(before, batch_size=500):
+    """Переносит в архив записи, созданные раньше before.
+
+    Генератор: после каждой пачки (своей транзакции) отдаёт её размер.
+    Записи, помеченные удалёнными, остаются на стирание purge_deleted.
+    """
+    while True:
+        archived = _archive_batch(before, batch_size)
+        if not archived:
+            break
+        yield archived
@@ -0,0 +1,187 @@
+"""Отложенная запись комментариев (write-behind).
+
+Проверенные формой комментарии дописываются в локальный журнал
+settings.COMMENT_QUEUE_PATH (одна JSON-строка на комментарий), а команда
+flush_comments переносит их в БД пачками через bulk_create. Пока
+комментарий в очереди, автор видит его на странице поста: копия лежит
+в кэше под ключом поста и автора.
+
+Каждая строка журнала несёт свой id и время создания. Если сброс упал
+после вставки, но до удаления журнала, повторный сброс пропускает
+комментарии, уже сохранённые с теми же (post, author, created).
+"""
+import fcntl
+import json
+import os
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from notifications import inbox
+from .models import Comment, Post
+
+
+def _overlay_key(post_id, author_id):
+    return f'pending_comments:{post_id}:{author_id}'
+
+
+def _append(path, entry):
+    line = json.dumps(entry, ensure_ascii=False) + '\n'
+    while True:
+        with open(path, 'a', encoding='utf-8') as queue:
+            fcntl.flock(queue, fcntl.LOCK_EX)
+            # Пока ждали блокировку, файл могли забрать на сброс.
+            if not os.path.exists(path) or not os.path.samestat(
+                os.fstat(queue.fileno()), os.stat(path)
+            ):
+                continue
+            queue.write(line)
+            queue.flush()
+            os.fsync(queue.fileno())
+            return
+
+
+def enqueue(post_id, author, text):
+    """Ставит комментарий в очередь и показывает его автору."""
+    entry = {
+        'id': uuid.uuid4().hex,
+        'post': post_id,
+        'author': author.pk,
+        'text': text,
+        'created': timezone.now().isoformat(),
+    }
+    _append(settings.COMMENT_QUEUE_PATH, entry)
+    key = _overlay_key(post_id, author.pk)
+    pending = cache.get(key, [])
+    pending.append(
+        {'id': entry['id'], 'text': text, 'created': entry['created']}
+    )
+    cache.set(key, pending, settings.COMMENT_QUEUE_OVERLAY_TIMEOUT)
+
+
+def pending_comments(post, user, comments):
+    """Несохранённые комментарии пользователя к посту.
+
+    Комментарии, которые уже попали в БД (есть в comments), пропускаются.
+    """
+    if not user.is_authenticated:
+        return []
+    pending = cache.get(_overlay_key(post.pk, user.pk))
+    if not pending:
+        return []
+    saved = {c.created for c in comments if c.author_id == user.pk}
+    result = []
+    for item in pending:
+        created = parse_datetime(item['created'])
+        if created not in saved:
+            result.append(Comment(
+                post=post, author=user, text=item['text'], created=created
+            ))
+    return result
+
+
+def _take_batch(path):
+    """Забирает накопленный журнал, новые записи пойдут в свежий файл."""
+    processing = path + '.processing'
+    if os.path.exists(processing):
+        # Предыдущий сброс не завершился: сначала дописываем его.
+        return processing
+    if not os.path.exists(path):
+        return None
+    with open(path, 'a') as queue:
+        fcntl.flock(queue, fcntl.LOCK_EX)
+        os.replace(path, processing)
+    return processing
+
+
+def _insert_keeping_created(comments):
+    """bulk_create, сохраняющий created из журнала.
+
+    created — поле auto_now_add, и bulk_create подставил бы время сброса.
+    Поэтому pre_save остальных полей (HTML текста и его хэш) вызывается
+    здесь, а строки вставляются как raw: значения берутся из объектов
+    как есть. Общие метаданные модели не меняются.
+    """
+    opts = Comment._meta
+    fields = [field for field in opts.concrete_fields if field is not opts.pk]
+    for comment in comments:
+        for field in fields:
+            if field.attname != 'created':
+                setattr(comment, field.attname, field.pre_save(comment, True))
+    manager = Comment._base_manager
+    batch_size = max(connection.ops.bulk_batch_size(fields, comments), 1)
+    with transaction.atomic():
+        for start in range(0, len(comments), batch_size):
+            manager._insert(
+                comments[start:start + batch_size], fields=fields, raw=True
+            )
+
+
+def _insert(entries):
+    """Вставляет ещё не сохранённые комментарии пачки."""
+    posts = set(Post.objects.filter(
+        pk__in={entry['post'] for entry in entries}
+    ).values_list('pk', flat=True))
+    saved = set(Comment.all_objects.filter(
+        post__in=posts, created__in={entry['created'] for entry in entries}
+    ).values_list('post_id', 'author_id', 'created'))
+    comments = [
+        Comment(
+            post_id=entry['post'],
+            author_id=entry['author'],
+            text=entry['text'],
+            created=entry['created'],
+        )
+        for entry in entries if entry['post'] in posts and (
+            entry['post'], entry['author'], entry['created']
+        ) not in saved
+    ]
+    _insert_keeping_created(comments)
+    inbox.comments_posted(comments)
+    return len(comments)
+
+
+def _forget_pending(entries):
+    """Убирает из копий в кэше только сброшенные комментарии.
+
+    Комментарии, добавленные после _take_batch, остаются видны автору.
+    """
+    flushed = {entry['id'] for entry in entries}
+    keys = {_overlay_key(entry['post'], entry['author']) for entry in entries}
+    remaining = {
+        key: [item for item in pending if item['id'] not in flushed]
+        for key, pending in cache.get_many(keys).items()
+    }
+    cache.set_many(
+        {key: pending for key, pending in remaining.items() if pending},
+        settings.COMMENT_QUEUE_OVERLAY_TIMEOUT,
+    )
+    cache.delete_many(
+        [key for key, pending in remaining.items() if not pending]
+    )
+
+
+def flush(batch_size=500):
+    """Переносит комментарии из очереди в БД. Возвращает их число."""
+    processing = _take_batch(settings.COMMENT_QUEUE_PATH)
+    if processing is None:
+        return 0
+    entries = {}
+    with open(processing, encoding='utf-8') as queue:
+        fcntl.flock(queue, fcntl.LOCK_SH)
+        for line in queue:
+            if line.strip():
+                entry = json.loads(line)
+                entry['created'] = parse_datetime(entry['created'])
+                entries[entry['id']] = entry
+    entries = list(entries.values())
+    count = 0
+    for start in range(0, len(entries), batch_size):
+        count += _insert(entries[start:start + batch_size])
+    _forget_pending(entries)
+    os.remove(processing)
+    return count
@@ -1,2 +1,4 @@
 POSTLIM: int = 10
 TEXTLIM: int = 15
+FEEDLIM: int = 20
+EXCERPTLIM: int = 300
@@ -0,0 +1,108 @@
+"""Уведомления о новых записях для потока server-sent events.
+
+Для каждого канала (общая лента, группа, автор) в кэше хранится счётчик
+опубликованных записей. Сигнал post_save увеличивает счётчики и будит
+ожидающие потоки этого процесса; изменения из других процессов
+замечаются опросом кэша раз в SSE_POLL_SECONDS. Идентификатор события —
+сумма счётчиков каналов, на которые подписан клиент.
+
+Под WSGI каждый открытый поток занимает поток воркера, поэтому потоков
+в процессе не больше SSE_MAX_STREAMS: остальным клиентам сразу
+отвечается только retry, и они переподключаются позже.
+"""
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+_published = threading.Condition()
+_streams_lock = threading.Lock()
+_open_streams = 0
+
+
+class StreamSlot:
+    """Место для одного потока; освобождается при закрытии ответа."""
+
+    def __init__(self):
+        self._closed = False
+
+    def close(self):
+        global _open_streams
+        with _streams_lock:
+            if not self._closed:
+                self._closed = True
+                _open_streams -= 1
+
+
+def open_stream():
+    """Занимает место для потока или возвращает None, если мест нет."""
+    global _open_streams
+    with _streams_lock:
+        if _open_streams >= settings.SSE_MAX_STREAMS:
+            return None
+        _open_streams += 1
+        return StreamSlot()
+
+
+def _key(channel):
+    return f'post_seq:{channel}'
+
+
+def post_channels(post):
+    channels = ['index', f'author:{post.author_id}']
+    if post.group_id:
+        channels.append(f'group:{post.group_id}')
+    return channels
+
+
+def publish(post):
+    """Отмечает новую запись во всех её каналах."""
+    for channel in post_channels(post):
+        cache.add(_key(channel), 0, None)
+        try:
+            cache.incr(_key(channel))
+        except ValueError:
+            cache.set(_key(channel), 1, None)
+    with _published:
+        _published.notify_all()
+
+
+def latest(channels):
+    return sum(cache.get_many([_key(c) for c in channels]).values())
+
+
+def wait_for_posts(channels, since, timeout):
+    """Ждёт новых записей не дольше timeout секунд."""
+    deadline = time.monotonic() + timeout
+    current = latest(channels)
+    while current <= since:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        with _published:
+            _published.wait(min(remaining, settings.SSE_POLL_SECONDS))
+        current = latest(channels)
+    return current
+
+
+def event_stream(channels, since):
+    """Поток SSE: одно уведомление или тишина до конца удержания.
+
+    Соединение закрывается после SSE_HOLD_SECONDS, клиент переподключается
+    через retry с Last-Event-ID, так что поток не держится бесконечно.
+    """
+    yield f'retry: {settings.SSE_RETRY_MS}\n\n'
+    if since is None:
+        since = latest(channels)
+        yield f'id: {since}\n\n'
+    current = wait_for_posts(channels, since, settings.SSE_HOLD_SECONDS)
+    if current > since:
+        data = json.dumps({'new': current - since})
+        yield f'id: {current}\nevent: posts\ndata: {data}\n\n'
+
+
+def busy_stream():
+    """Ответ без ожидания: клиент переподключится через SSE_BUSY_RETRY_MS."""
+    yield f'retry: {settings.SSE_BUSY_RETRY_MS}\n\n'
@@ -0,0 +1,183 @@
+"""RSS/Atom-ленты: общая, по группе и по автору.
+
+Каждая лента кэшируется до следующей записи в её области (scope).
+Метка времени области хранится в кэше и обновляется сигналами Post,
+поэтому ответ 304 на If-Modified-Since не обращается к БД.
+"""
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from .const import FEEDLIM
+from .models import Group, Post, User
+
+
+def stamp_key(scope):
+    return f'feed_stamp:{scope}'
+
+
+def scope_exists(scope):
+    kind, _, name = scope.partition(':')
+    if kind == 'group':
+        return Group.objects.filter(slug=name).exists()
+    if kind == 'author':
+        return User.objects.filter(username=name).exists()
+    return True
+
+
+def get_stamp(scope):
+    """Время последнего изменения области (создаётся при первом запросе).
+
+    Метка бессрочная, поэтому перед созданием область проверяется в БД:
+    для несуществующих групп и авторов — 404 без метки в кэше.
+    """
+    stamp = cache.get(stamp_key(scope))
+    if stamp is None:
+        if not scope_exists(scope):
+            raise Http404
+        stamp = time.time()
+        cache.add(stamp_key(scope), stamp, None)
+    return stamp
+
+
+def touch(scopes):
+    """Отмечает, что записи в областях изменились.
+
+    Last-Modified имеет точность до секунды, поэтому новая метка
+    всегда хотя бы на секунду старше прежней.
+    """
+    keys = [stamp_key(scope) for scope in scopes]
+    old = cache.get_many(keys)
+    now = time.time()
+    cache.set_many({
+        key: max(now, int(old.get(key, 0)) + 1) for key in keys
+    }, None)
+
+
+def post_scopes(post, group_slugs=()):
+    scopes = {'index', f'author:{post.author.username}'}
+    if post.group_id:
+        scopes.add(f'group:{post.group.slug}')
+    scopes.update(f'group:{slug}' for slug in group_slugs)
+    return scopes
+
+
+class PostsFeed(Feed):
+    title = 'Yatube: последние записи'
+    link = reverse_lazy('posts:index')
+    description = 'Новые записи всех авторов'
+
+    def items(self):
+        return Post.objects.select_related('author', 'group')[:FEEDLIM]
+
+    def item_title(self, item):
+        return Truncator(item.text).words(8)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=[item.pk])
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.created
+
+    def item_updateddate(self, item):
+        return item.updated
+
+
+class GroupFeed(PostsFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def title(self, obj):
+        return f'Yatube: {obj.title}'
+
+    def link(self, obj):
+        return reverse('posts:group_list', args=[obj.slug])
+
+    def description(self, obj):
+        return obj.description
+
+    def items(self, obj):
+        return obj.group_posts.select_related('author', 'group')[:FEEDLIM]
+
+
+class AuthorFeed(PostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Yatube: записи {obj.get_full_name() or obj.username}'
+
+    def link(self, obj):
+        return reverse('posts:profile', args=[obj.username])
+
+    def description(self, obj):
+        return f'Новые записи пользователя {obj.username}'
+
+    def items(self, obj):
+        return obj.posts.select_related('author', 'group')[:FEEDLIM]
+
+
+class AtomMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj=None):
+        return self._get_dynamic_attr('description', obj)
+
+
+class PostsAtomFeed(AtomMixin, PostsFeed):
+    pass
+
+
+class GroupAtomFeed(AtomMixin, GroupFeed):
+    pass
+
+
+class AuthorAtomFeed(AtomMixin, AuthorFeed):
+    pass
+
+
+def feed_scope(kwargs):
+    if 'slug' in kwargs:
+        return f'group:{kwargs["slug"]}'
+    if 'username' in kwargs:
+        return f'author:{kwargs["username"]}'
+    return 'index'
+
+
+def cached_feed(feed_class):
+    """View ленты с Last-Modified и кэшем до следующей записи в области."""
+    feed = feed_class()
+    name = feed_class.__name__
+
+    def last_modified(request, **kwargs):
+        return datetime.fromtimestamp(
+            get_stamp(feed_scope(kwargs)), tz=timezone.utc
+        )
+
+    @condition(last_modified_func=last_modified)
+    def view(request, **kwargs):
+        scope = feed_scope(kwargs)
+        key = f'feed:{name}:{scope}:{get_stamp(scope)}'
+        cached = cache.get(key)
+        if cached is None:
+            response = feed(request, **kwargs)
+            cached = (response.content, response['Content-Type'])
+            cache.set(key, cached, settings.FEED_CACHE_TIMEOUT)
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+    return view
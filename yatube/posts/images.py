@@ -0,0 +1,96 @@
+"""Адаптивные варианты картинок постов для srcset.
+
+Исходник декодируется один раз: из него вырезается кадр с пропорциями
+IMAGE_VARIANT_RATIO, и все ширины IMAGE_VARIANT_WIDTHS (JPEG и, если
+включено, WebP) уменьшаются из этого кадра за один проход.
+"""
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+FORMATS = {'jpeg': ('jpg', 'JPEG'), 'webp': ('webp', 'WEBP')}
+
+
+def variants_dir(name):
+    return posixpath.join('variants', posixpath.splitext(name)[0])
+
+
+def variant_name(name, width, kind):
+    return posixpath.join(variants_dir(name), f'{width}.{FORMATS[kind][0]}')
+
+
+def variant_kinds():
+    return ('jpeg', 'webp') if settings.IMAGE_VARIANT_WEBP else ('jpeg',)
+
+
+def variant_size(width):
+    ratio_width, ratio_height = settings.IMAGE_VARIANT_RATIO
+    return width, round(width * ratio_height / ratio_width)
+
+
+def render_variants(image_file):
+    """Декодирует исходник один раз и сохраняет все варианты."""
+    widths = sorted(settings.IMAGE_VARIANT_WIDTHS, reverse=True)
+    with image_file.open('rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image).convert('RGB')
+    frame = ImageOps.fit(image, variant_size(widths[0]), Image.LANCZOS)
+    for width in widths:
+        resized = frame.resize(variant_size(width), Image.LANCZOS)
+        for kind in variant_kinds():
+            buffer = BytesIO()
+            resized.save(
+                buffer, FORMATS[kind][1],
+                quality=settings.IMAGE_VARIANT_QUALITY,
+            )
+            name = variant_name(image_file.name, width, kind)
+            default_storage.delete(name)
+            default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def get_variants(image_file):
+    """{формат: [(url, ширина), ...]} для картинки или None.
+
+    Результат кэшируется по имени файла; имя задаётся содержимым
+    (ContentAddressedStorage), поэтому варианты не устаревают.
+    """
+    if not image_file:
+        return None
+    key = f'image_variants:{image_file.name}'
+    variants = cache.get(key)
+    if variants is not None:
+        return variants
+    widths = sorted(settings.IMAGE_VARIANT_WIDTHS)
+    try:
+        if not default_storage.exists(
+            variant_name(image_file.name, widths[-1], 'jpeg')
+        ):
+            render_variants(image_file)
+    except (OSError, SuspiciousFileOperation):
+        # Исходника нет или это не картинка.
+        return None
+    variants = {
+        kind: [
+            (default_storage.url(variant_name(image_file.name, w, kind)), w)
+            for w in widths
+        ]
+        for kind in variant_kinds()
+    }
+    cache.set(key, variants, None)
+    return variants
+
+
+def delete_variants(name):
+    cache.delete(f'image_variants:{name}')
+    try:
+        for width in settings.IMAGE_VARIANT_WIDTHS:
+            for kind in FORMATS:
+                default_storage.delete(variant_name(name, width, kind))
+    except SuspiciousFileOperation:
+        pass
@@ -0,0 +1,34 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts import archive
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые записи и их комментарии в архивные таблицы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=settings.POST_ARCHIVE_AFTER,
+            help='Архивировать записи старше N дней.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Сколько записей переносить в одной транзакции.',
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.1,
+            help='Пауза между пачками в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['older_than'])
+        total = 0
+        for count in archive.archive_posts(before, options['batch_size']):
+            total += count
+            time.sleep(options['pause'])
+        self.stdout.write(f'Перенесено в архив записей: {total}')
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts import comment_queue
+
+
+class Command(BaseCommand):
+    help = 'Переносит комментарии из очереди отложенной записи в БД.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Сколько комментариев вставлять одним запросом.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять сброс каждые N секунд (0 — один раз).',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = comment_queue.flush(options['batch_size'])
+            if count:
+                self.stdout.write(f'Сохранено комментариев: {count}')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from posts import tags
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Заполняет индекс хэштегов и упоминаний для существующих записей.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Сколько записей читать за раз.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('pk').only('text', 'created')
+        indexed = 0
+        last_pk = 0
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:options['batch_size']])
+            if not batch:
+                break
+            for post in batch:
+                tags.sync(post)
+            indexed += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(f'Проиндексировано записей: {indexed}')
@@ -0,0 +1,44 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts import moderation
+from users import deletion
+
+
+class Command(BaseCommand):
+    help = ('Стирает записи и комментарии, помеченные удалёнными, '
+            'и удалённых из админки пользователей.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Сколько строк стирать в одной транзакции.',
+        )
+        parser.add_argument(
+            '--older-than', type=int, default=settings.SOFT_DELETE_RETENTION,
+            help='Стирать строки, удалённые больше N секунд назад.',
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.1,
+            help='Пауза между пачками в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(seconds=options['older_than'])
+        totals = {}
+        for model, count in moderation.purge_deleted(
+            before, options['batch_size']
+        ):
+            name = model._meta.verbose_name_plural
+            totals[name] = totals.get(name, 0) + count
+            time.sleep(options['pause'])
+        # Пользователи — после их содержимого, чтобы каскад был маленьким.
+        users = deletion.purge_users(before)
+        if users:
+            totals['пользователей'] = users
+        for name, count in totals.items():
+            self.stdout.write(f'Стёрто {name}: {count}')
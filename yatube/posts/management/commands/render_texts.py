@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from core import markup
+from posts.models import ArchivedComment, ArchivedPost, Comment, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет HTML-версию текста записей и комментариев, '
+        'у которых текст или версия разметки изменились.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Сколько строк читать и обновлять за раз.',
+        )
+
+    def render_model(self, model, batch_size):
+        rows = model._base_manager.order_by('pk').only('text', 'text_hash')
+        rendered = 0
+        last_pk = 0
+        while True:
+            batch = list(rows.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return rendered
+            last_pk = batch[-1].pk
+            changed = []
+            for row in batch:
+                digest = markup.text_hash(row.text)
+                if row.text_hash != digest:
+                    row.text_html = markup.render(row.text)
+                    row.text_hash = digest
+                    changed.append(row)
+            model._base_manager.bulk_update(
+                changed, ('text_html', 'text_hash')
+            )
+            rendered += len(changed)
+
+    def handle(self, *args, **options):
+        for model in (Post, Comment, ArchivedPost, ArchivedComment):
+            rendered = self.render_model(model, options['batch_size'])
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: '
+                f'отрисовано {rendered}'
+            )
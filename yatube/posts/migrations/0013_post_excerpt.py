@@ -0,0 +1,34 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:35
+
+import core.fields
+from django.db import migrations
+
+
+def fill_excerpts(apps, schema_editor):
+    for name in ('Post', 'ArchivedPost'):
+        model = apps.get_model('posts', name)
+        rows = list(model.objects.only('pk', 'text'))
+        for row in rows:
+            row.excerpt = core.fields.excerpt(row.text, 300)
+        model.objects.bulk_update(rows, ['excerpt'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedpost',
+            name='excerpt',
+            field=core.fields.ExcerptField(blank=True, editable=False, length=300, source='text', verbose_name='Начало текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=core.fields.ExcerptField(blank=True, editable=False, length=300, source='text', verbose_name='Начало текста'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
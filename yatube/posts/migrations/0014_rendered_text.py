@@ -0,0 +1,54 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:36
+
+import core.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedcomment',
+            name='text_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Хэш текста'),
+        ),
+        migrations.AddField(
+            model_name='archivedcomment',
+            name='text_html',
+            field=core.fields.RenderedTextField(blank=True, editable=False, hash_field='text_hash', source='text', verbose_name='Текст в HTML'),
+        ),
+        migrations.AddField(
+            model_name='archivedpost',
+            name='text_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Хэш текста'),
+        ),
+        migrations.AddField(
+            model_name='archivedpost',
+            name='text_html',
+            field=core.fields.RenderedTextField(blank=True, editable=False, hash_field='text_hash', source='text', verbose_name='Текст в HTML'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='text_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Хэш текста'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='text_html',
+            field=core.fields.RenderedTextField(blank=True, editable=False, hash_field='text_hash', source='text', verbose_name='Текст в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Хэш текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=core.fields.RenderedTextField(blank=True, editable=False, hash_field='text_hash', source='text', verbose_name='Текст в HTML'),
+        ),
+    ]
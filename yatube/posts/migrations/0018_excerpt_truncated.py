@@ -0,0 +1,48 @@
+# Generated by Django 2.2.16 on 2026-10-19 11:13
+
+import core.fields
+from django.db import migrations, models
+
+
+def fill_truncated(apps, schema_editor):
+    # Заодно пересчитываем начало: обрезка по словам учитывает переносы.
+    for name in ('Post', 'ArchivedPost'):
+        model = apps.get_model('posts', name)
+        rows = list(model.objects.only('pk', 'text'))
+        for row in rows:
+            row.excerpt = core.fields.excerpt(row.text, 300)
+            row.excerpt_truncated = len(row.text.strip()) > 300
+        model.objects.bulk_update(
+            rows, ['excerpt', 'excerpt_truncated'], batch_size=500
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_image_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedpost',
+            name='excerpt_truncated',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Текст обрезан'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_truncated',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Текст обрезан'),
+        ),
+        migrations.AlterField(
+            model_name='archivedpost',
+            name='excerpt',
+            field=core.fields.ExcerptField(blank=True, editable=False, length=300, source='text', truncated_field='excerpt_truncated', verbose_name='Начало текста'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='excerpt',
+            field=core.fields.ExcerptField(blank=True, editable=False, length=300, source='text', truncated_field='excerpt_truncated', verbose_name='Начало текста'),
+        ),
+        migrations.RunPython(fill_truncated, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,10 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
-from core.models import CreatedModel
-from .const import TEXTLIM
+from core.fields import ExcerptField, RenderedTextField
+from core.models import CreatedModel, SoftDeleteModel
+from .const import EXCERPTLIM, TEXTLIM
+from .storage import content_storage
 
 User = get_user_model()
 
@@ -16,8 +18,21 @@ class Group(models.Model):
         return self.title
 
 
-class Post(CreatedModel):
+class Post(SoftDeleteModel, CreatedModel):
     text = models.TextField()
+    excerpt = ExcerptField(
+        'Начало текста',
+        source='text',
+        length=EXCERPTLIM,
+        truncated_field='excerpt_truncated',
+        blank=True,
+        editable=False
+    )
+    excerpt_truncated = models.BooleanField(
+        'Текст обрезан',
+        default=False,
+        editable=False
+    )
     author = models.ForeignKey(User,
                                on_delete=models.CASCADE,
                                related_name='posts')
@@ -29,19 +44,48 @@ class Post(CreatedModel):
     image = models.ImageField(
         'Картинка',
         upload_to='posts/',
+        storage=content_storage,
         blank=True,
         null=True,
+        # По имени файла release_image ищет оставшиеся ссылки.
+        db_index=True,
         help_text='Загрузите картинку'
     )
+    updated = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
+    text_html = RenderedTextField(
+        'Текст в HTML',
+        source='text',
+        hash_field='text_hash',
+        blank=True,
+        editable=False
+    )
+    text_hash = models.CharField(
+        'Хэш текста',
+        max_length=64,
+        blank=True,
+        editable=False
+    )
+
+    is_archived = False
 
     class Meta:
         ordering = ('-created',)
+        indexes = [
+            models.Index(fields=('created',), name='post_created_idx'),
+        ]
 
     def __str__(self):
         return self.text[:TEXTLIM]
 
+    @property
+    def is_truncated(self):
+        return self.excerpt_truncated
 
-class Comment(CreatedModel):
+
+class Comment(SoftDeleteModel, CreatedModel):
     post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
@@ -56,6 +100,202 @@ class Comment(CreatedModel):
         'Текст комментария',
         help_text='Введите текст комментария'
     )
+    text_html = RenderedTextField(
+        'Текст в HTML',
+        source='text',
+        hash_field='text_hash',
+        blank=True,
+        editable=False
+    )
+    text_hash = models.CharField(
+        'Хэш текста',
+        max_length=64,
+        blank=True,
+        editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=('created',), name='comment_created_idx'),
+        ]
+
+
+class ArchivedPost(models.Model):
+    """Запись, перенесённая командой archive_posts из горячей таблицы.
+
+    Первичный ключ совпадает с ключом исходной записи, поэтому ссылки
+    на пост продолжают работать. Архив только для чтения.
+    """
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField()
+    excerpt = ExcerptField(
+        'Начало текста',
+        source='text',
+        length=EXCERPTLIM,
+        truncated_field='excerpt_truncated',
+        blank=True,
+        editable=False
+    )
+    excerpt_truncated = models.BooleanField(
+        'Текст обрезан',
+        default=False,
+        editable=False
+    )
+    author = models.ForeignKey(User,
+                               on_delete=models.CASCADE,
+                               related_name='archived_posts')
+    group = models.ForeignKey(Group,
+                              blank=True,
+                              null=True,
+                              on_delete=models.CASCADE,
+                              related_name='archived_posts')
+    image = models.ImageField(
+        'Картинка',
+        upload_to='posts/',
+        storage=content_storage,
+        blank=True,
+        null=True,
+        db_index=True
+    )
+    created = models.DateTimeField('Дата создания')
+    updated = models.DateTimeField('Дата изменения')
+    text_html = RenderedTextField(
+        'Текст в HTML',
+        source='text',
+        hash_field='text_hash',
+        blank=True,
+        editable=False
+    )
+    text_hash = models.CharField(
+        'Хэш текста',
+        max_length=64,
+        blank=True,
+        editable=False
+    )
+
+    is_archived = True
+
+    class Meta:
+        ordering = ('-created',)
+        indexes = [
+            models.Index(fields=('created',),
+                         name='archived_post_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.text[:TEXTLIM]
+
+    @property
+    def is_truncated(self):
+        return self.excerpt_truncated
+
+
+class ArchiveCount(models.Model):
+    """Сколько записей области лежит в архиве.
+
+    Области: index (все записи), author:<id>, group:<id>. Счётчики
+    обновляет archive_posts, так что ленты не считают архив COUNT(*).
+    """
+    scope = models.CharField('Область', max_length=64, unique=True)
+    count = models.PositiveIntegerField('Записей', default=0)
+
+    def __str__(self):
+        return self.scope
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments'
+    )
+    text = models.TextField('Текст комментария')
+    created = models.DateTimeField('Дата создания')
+    text_html = RenderedTextField(
+        'Текст в HTML',
+        source='text',
+        hash_field='text_hash',
+        blank=True,
+        editable=False
+    )
+    text_hash = models.CharField(
+        'Хэш текста',
+        max_length=64,
+        blank=True,
+        editable=False
+    )
+
+
+class Tag(models.Model):
+    """Хэштег (#тег) или упоминание (@username) из текстов записей.
+
+    Счётчики денормализованы: post_count — все записи с тегом,
+    archived_count — те из них, что уже в архиве. Страница тега
+    пагинируется по ним без COUNT(*).
+    """
+    name = models.CharField('Тег', max_length=151, unique=True)
+    post_count = models.PositiveIntegerField('Записей', default=0)
+    archived_count = models.PositiveIntegerField('В архиве', default=0)
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def slug(self):
+        return self.name.lstrip('#')
+
+
+class PostTag(models.Model):
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='post_tags'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='post_tags'
+    )
+    # Копия post.created: лента тега читается по индексу (tag, created).
+    created = models.DateTimeField('Дата создания записи')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'tag'], name='unique_post_tag'
+            )
+        ]
+        indexes = [
+            models.Index(fields=('tag', 'created'),
+                         name='posttag_tag_created_idx'),
+        ]
+
+
+class ArchivedPostTag(models.Model):
+    id = models.IntegerField(primary_key=True)
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='archived_post_tags'
+    )
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='post_tags'
+    )
+    created = models.DateTimeField('Дата создания записи')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=('tag', 'created'),
+                         name='archived_tag_created_idx'),
+        ]
 
 
 class Follow(CreatedModel):
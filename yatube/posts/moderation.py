@@ -0,0 +1,124 @@
+"""Массовая модерация одним набором UPDATE/DELETE.
+
+Стандартное удаление Django загружает каждый объект, чтобы разослать
+сигналы и пройти каскады. Здесь модерация только помечает строки
+удалёнными одним UPDATE, а кэши лент сбрасываются один раз на всю пачку.
+Физически строки стирает purge_deleted: небольшими пачками, каждая в своей
+короткой транзакции, чтобы не держать блокировку SQLite.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from . import feeds
+from .models import Comment, Post
+from .signals import release_image
+
+
+def _scopes(posts):
+    """Области лент, которые затронет изменение записей."""
+    scopes = {'index'}
+    for username, slug in posts.order_by().values_list(
+        'author__username', 'group__slug'
+    ).distinct():
+        scopes.add(f'author:{username}')
+        if slug:
+            scopes.add(f'group:{slug}')
+    return scopes
+
+
+def erase_posts(posts):
+    """Удаляет записи и всё, что на них ссылается, без загрузки объектов."""
+    using = posts.db
+    for relation in Post._meta.related_objects:
+        related = relation.related_model._base_manager.filter(
+            **{f'{relation.field.name}__in': posts.values('pk')}
+        )
+        if relation.on_delete is models.CASCADE:
+            related._raw_delete(using)
+        elif relation.on_delete is models.SET_NULL:
+            related.update(**{relation.field.name: None})
+    return posts._raw_delete(using)
+
+
+def _finish(scopes, image_names):
+    if scopes:
+        feeds.touch(scopes)
+    for name in image_names:
+        release_image(name)
+
+
+def delete_authors_content(author_ids):
+    """Помечает удалёнными записи и комментарии авторов.
+
+    Возвращает число записей и комментариев.
+    """
+    posts = Post.objects.filter(author__in=author_ids)
+    comments = Comment.objects.filter(author__in=author_ids)
+    with transaction.atomic():
+        scopes = _scopes(posts)
+        comments_deleted = comments.delete()
+        posts_deleted = posts.delete()
+    _finish(scopes, ())
+    return posts_deleted, comments_deleted
+
+
+def move_posts(posts, group):
+    """Переносит записи в группу (или убирает из групп, если group=None)."""
+    with transaction.atomic():
+        scopes = _scopes(posts)
+        moved = posts.update(group=group, updated=timezone.now())
+    if group is not None:
+        scopes.add(f'group:{group.slug}')
+    _finish(scopes, ())
+    return moved
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def purge_comments(date_from, date_to):
+    """Помечает удалёнными комментарии за промежуток дат включительно.
+
+    Границы — моменты начала дней: условие на сам created использует
+    индекс, а created__date вычислялось бы для каждой строки.
+    """
+    return Comment.objects.filter(
+        created__gte=_day_start(date_from),
+        created__lt=_day_start(date_to + timedelta(days=1)),
+    ).delete()
+
+
+def _purge_batch(model, before, batch_size):
+    pks = list(
+        model.all_objects.filter(deleted__lte=before)
+        .order_by('deleted').values_list('pk', flat=True)[:batch_size]
+    )
+    if not pks:
+        return 0, ()
+    rows = model.all_objects.filter(pk__in=pks)
+    with transaction.atomic():
+        if model is not Post:
+            return rows._raw_delete(rows.db), ()
+        image_names = set(
+            rows.exclude(image='').exclude(image=None)
+            .values_list('image', flat=True)
+        )
+        return erase_posts(rows), image_names
+
+
+def purge_deleted(before, batch_size=500):
+    """Стирает строки, помеченные удалёнными не позже before.
+
+    Генератор: после каждой пачки отдаёт (модель, число строк), так что
+    вызывающий код может делать паузы между транзакциями.
+    """
+    for model in (Comment, Post):
+        while True:
+            purged, image_names = _purge_batch(model, before, batch_size)
+            if not purged:
+                break
+            _finish((), image_names)
+            yield model, purged
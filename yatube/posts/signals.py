@@ -0,0 +1,115 @@
+from functools import partial
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from sorl.thumbnail import default as thumbnail_default
+from sorl.thumbnail.images import ImageFile
+
+from core.signals import soft_deleted
+from notifications import inbox
+from notifications.models import Notification
+from . import events, feeds, images, tags
+from .models import ArchivedPost, Group, Post, User
+
+
+def release_image(name):
+    """Удаляет картинку и её миниатюры, если постов с ней не осталось.
+
+    Число ссылок на файл — это число постов с таким image, отдельный
+    счётчик не нужен: имя файла однозначно задаётся содержимым. Помеченные
+    удалёнными посты тоже считаются, пока их не стёр purge_deleted.
+    """
+    if not name or Post.all_objects.filter(image=name).exists():
+        return
+    if ArchivedPost.objects.filter(image=name).exists():
+        return
+    storage = Post._meta.get_field('image').storage
+    try:
+        if not storage.exists(name):
+            return
+    except SuspiciousFileOperation:
+        # Путь вне MEDIA_ROOT: файл не наш, удалять нечего.
+        return
+    thumbnail_default.kvstore.delete(ImageFile(name, storage))
+    images.delete_variants(name)
+    storage.delete(name)
+
+
+def notify_mentions(post, tag_names):
+    usernames = [name[1:] for name in tag_names if name.startswith('@')]
+    if usernames:
+        inbox.notify(
+            Notification.MENTION,
+            post.author,
+            User.objects.filter(
+                username__in=usernames
+            ).values_list('pk', flat=True),
+            post=post,
+        )
+
+
+@receiver(post_init, sender=Post)
+def remember_loaded(sender, instance, **kwargs):
+    # Берём значения из __dict__, чтобы не загружать отложенные поля.
+    image = instance.__dict__.get('image')
+    instance._loaded_group_id = instance.__dict__.get('group_id')
+    instance._loaded_image = getattr(image, 'name', image)
+    instance._loaded_text_hash = instance.__dict__.get('text_hash')
+
+
+@receiver(pre_save, sender=Post)
+def keep_upload(sender, instance, **kwargs):
+    # После сохранения поле хранит только имя: загруженный файл
+    # запоминаем, чтобы восстановить его после коммита.
+    image = instance.image if 'image' in instance.__dict__ else None
+    instance._image_upload = (
+        image.file if image and not image._committed else None
+    )
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    if created:
+        events.publish(instance)
+    old_slugs = ()
+    old_group_id = instance._loaded_group_id
+    if old_group_id and old_group_id != instance.group_id:
+        old_slugs = Group.objects.filter(
+            pk=old_group_id
+        ).values_list('slug', flat=True)
+    feeds.touch(feeds.post_scopes(instance, old_slugs))
+    if instance._loaded_image != instance.image.name:
+        release_image(instance._loaded_image)
+    if getattr(instance, '_image_upload', None) is not None:
+        # Ссылка на файл видна другим соединениям только после коммита;
+        # если одновременный release_image успел стереть файл, пишем его
+        # заново.
+        transaction.on_commit(partial(
+            instance.image.storage.restore,
+            instance.image.name, instance._image_upload,
+        ))
+        instance._image_upload = None
+    if (instance._loaded_text_hash != instance.text_hash
+            and instance.deleted is None):
+        notify_mentions(instance, tags.sync(instance))
+    remember_loaded(sender, instance)
+
+
+@receiver(soft_deleted, sender=Post)
+def posts_soft_deleted(sender, queryset, **kwargs):
+    tags.forget(queryset)
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    tags.forget(Post.all_objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    feeds.touch(feeds.post_scopes(instance))
+    release_image(instance.image.name)
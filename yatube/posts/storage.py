@@ -0,0 +1,50 @@
+import hashlib
+import os
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит файл под хэшем его содержимого.
+
+    Одинаковые загрузки получают одно имя (posts/ab/abcd….gif) и
+    записываются на диск один раз, поэтому и миниатюры для них
+    строятся один раз. Файл удаляется, когда на него не ссылается
+    ни один пост (см. posts.signals).
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        directory, filename = posixpath.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        digest = digest.hexdigest()
+        name = posixpath.join(directory, digest[:2], digest + extension)
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length)
+
+    def restore(self, name, content):
+        """Записывает файл заново, если его удалили после save.
+
+        save не пишет файл, который уже есть на диске. Если последний
+        пост с той же картинкой удаляли одновременно, release_image мог
+        стереть файл до того, как новая ссылка на него попала в базу.
+        """
+        if self.exists(name):
+            return
+        content.seek(0)
+        super().save(name, content)
+
+
+content_storage = ContentAddressedStorage()
@@ -0,0 +1,82 @@
+"""Индекс хэштегов и упоминаний.
+
+Теги записи пересчитываются в post_save, когда меняется её текст.
+Счётчики в Tag правятся тем же кодом, что добавляет и удаляет строки
+PostTag, поэтому страница тега не считает записи запросом COUNT(*).
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from core.markup import extract_tags
+from .models import PostTag, Tag
+
+
+def _adjust(deltas, field):
+    """Сдвигает счётчик field тегов: по запросу на каждую величину сдвига."""
+    by_delta = defaultdict(list)
+    for tag_id, delta in deltas.items():
+        by_delta[delta].append(tag_id)
+    for delta, tag_ids in by_delta.items():
+        Tag.objects.filter(pk__in=tag_ids).update(
+            **{field: F(field) + delta}
+        )
+
+
+def _counts(rows):
+    return dict(
+        rows.order_by().values('tag').annotate(n=Count('pk'))
+        .values_list('tag', 'n')
+    )
+
+
+def tag_name(slug):
+    """Имя тега из адреса /tag/<slug>/: упоминания начинаются с @."""
+    return slug if slug.startswith('@') else f'#{slug.casefold()}'
+
+
+def sync(post):
+    """Приводит строки PostTag записи в соответствие с её текстом.
+
+    Возвращает имена тегов, которых у записи раньше не было.
+    """
+    wanted = extract_tags(post.text)
+    current = dict(
+        PostTag.objects.filter(post=post).values_list('tag__name', 'tag_id')
+    )
+    added = wanted - current.keys()
+    removed = [current[name] for name in current.keys() - wanted]
+    with transaction.atomic():
+        if removed:
+            PostTag.objects.filter(post=post, tag__in=removed).delete()
+            _adjust(dict.fromkeys(removed, -1), 'post_count')
+        if added:
+            Tag.objects.bulk_create(
+                [Tag(name=name) for name in added], ignore_conflicts=True
+            )
+            tag_ids = list(Tag.objects.filter(
+                name__in=added
+            ).values_list('pk', flat=True))
+            PostTag.objects.bulk_create(
+                PostTag(tag_id=tag_id, post=post, created=post.created)
+                for tag_id in tag_ids
+            )
+            _adjust(dict.fromkeys(tag_ids, 1), 'post_count')
+    return added
+
+
+def forget(posts):
+    """Убирает записи queryset posts со страниц тегов."""
+    rows = PostTag.objects.filter(post__in=posts.values('pk'))
+    counts = _counts(rows)
+    if counts:
+        rows.delete()
+        _adjust({tag: -n for tag, n in counts.items()}, 'post_count')
+
+
+def archive(post_ids):
+    """Учитывает в счётчиках, что записи post_ids уходят в архив."""
+    _adjust(
+        _counts(PostTag.objects.filter(post__in=post_ids)), 'archived_count'
+    )
@@ -0,0 +1,47 @@
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+def card_key(post):
+    """Ключ версии карточки.
+
+    Кроме даты изменения поста в ключ входят имя автора и слаг группы:
+    они тоже выводятся в карточке, но меняются без сохранения поста.
+    """
+    author = post.author
+    shown = '\n'.join((
+        author.username,
+        author.get_full_name(),
+        post.group.slug if post.group_id else '',
+    ))
+    digest = hashlib.md5(shown.encode('utf-8')).hexdigest()
+    return f'post_card:{post.pk}:{post.updated.timestamp()}:{digest}'
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Список отрендеренных карточек постов для ленты.
+
+    Карточка рендерится один раз на версию поста (см. card_key) и
+    переиспользуется всеми лентами. Все карточки страницы
+    достаются из кэша одним get_many.
+    """
+    posts = list(posts)
+    keys = [card_key(post) for post in posts]
+    cards = cache.get_many(keys)
+    missing = {}
+    for post, key in zip(posts, keys):
+        if key not in cards:
+            cards[key] = missing[key] = render_to_string(
+                'posts/includes/post_card.html', {'post': post}
+            )
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_TIMEOUT)
+    return [mark_safe(cards[key]) for key in keys]
@@ -0,0 +1,26 @@
+from django import template
+from django.conf import settings
+
+from ..images import get_variants, variant_size
+
+register = template.Library()
+
+
+@register.inclusion_tag('posts/includes/picture.html')
+def responsive_image(image_file):
+    """<picture> с srcset из заранее подготовленных вариантов картинки."""
+    variants = get_variants(image_file)
+    if not variants:
+        return {'variants': None}
+    width, height = variant_size(max(settings.IMAGE_VARIANT_WIDTHS))
+    return {
+        'srcset': {
+            kind: ', '.join(f'{url} {w}w' for url, w in urls)
+            for kind, urls in variants.items()
+        },
+        'variants': variants,
+        'src': variants['jpeg'][-1][0],
+        'width': width,
+        'height': height,
+        'sizes': f'(max-width: {width}px) 100vw, {width}px',
+    }
@@ -0,0 +1,166 @@
+from django.db import connection
+from django.db.models import Max
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Comment, Group, Post, User
+
+
+class AdminChangelistTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        groups = [
+            Group.objects.create(
+                title=f'Группа {i}', slug=f'slug-{i}', description='-'
+            )
+            for i in range(5)
+        ]
+        for i in range(30):
+            post = Post.objects.create(
+                author=cls.admin, text=f'Запись {i}', group=groups[i % 5]
+            )
+            Comment.objects.create(post=post, author=cls.admin, text='-')
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def changelist_queries(self, model):
+        url = reverse(f'admin:posts_{model}_changelist')
+        with CaptureQueriesContext(connection) as context:
+            response = self.admin_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов списка не зависит от числа строк"""
+        # Первый запрос ещё кладёт сессию и пользователя в кэш.
+        self.changelist_queries('post')
+        before = {
+            model: self.changelist_queries(model)
+            for model in ('post', 'comment')
+        }
+        group = Group.objects.create(title='Ещё', slug='more', description='-')
+        for i in range(10):
+            post = Post.objects.create(
+                author=self.admin, text=f'Ещё {i}', group=group
+            )
+            Comment.objects.create(post=post, author=self.admin, text='-')
+        for model, queries in before.items():
+            with self.subTest(model=model):
+                self.assertEqual(self.changelist_queries(model), queries)
+                self.assertLessEqual(queries, 10)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=10)
+    def test_estimated_count_for_unfiltered_list(self):
+        """Без фильтров большой список считается по оценке"""
+        # Пропуски в первичных ключах: оценка MAX(pk) больше COUNT(*).
+        for post in Post.objects.order_by('pk')[:5]:
+            post.hard_delete()
+        top = Post.objects.aggregate(top=Max('pk'))['top']
+        self.assertNotEqual(top, Post.objects.count())
+        url = reverse('admin:posts_post_changelist')
+        response = self.admin_client.get(url)
+        self.assertEqual(response.context['cl'].result_count, top)
+        response = self.admin_client.get(url, {'q': 'Запись'})
+        self.assertEqual(
+            response.context['cl'].result_count, Post.objects.count()
+        )
+
+
+class ModerationActionTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        self.spammer = User.objects.create_user(username='spammer')
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='-'
+        )
+        self.spam = [
+            Post.objects.create(author=self.spammer, text=f'Спам {i}')
+            for i in range(3)
+        ]
+        self.post = Post.objects.create(author=self.author, text='Запись')
+        Comment.objects.create(post=self.spam[0], author=self.author, text='-')
+        Comment.objects.create(post=self.post, author=self.spammer, text='-')
+        self.kept = Comment.objects.create(
+            post=self.post, author=self.author, text='-'
+        )
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def run_action(self, model, action, selected, **data):
+        return self.admin_client.post(
+            reverse(f'admin:posts_{model}_changelist'),
+            {'action': action, '_selected_action': selected, **data},
+            follow=True,
+        )
+
+    def test_delete_authors_content(self):
+        """Удаляются все записи и комментарии выбранных авторов"""
+        with CaptureQueriesContext(connection) as context:
+            self.run_action(
+                'post', 'delete_authors_content', [self.spam[0].pk]
+            )
+        self.assertFalse(Post.objects.filter(author=self.spammer).exists())
+        self.assertFalse(
+            Comment.objects.exclude(pk=self.kept.pk).exists()
+        )
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+        self.assertTrue(Comment.objects.filter(pk=self.kept.pk).exists())
+        self.assertLess(len(context), 30)
+
+    def test_move_to_group(self):
+        """Выбранные записи переносятся в группу одним запросом"""
+        selected = [post.pk for post in self.spam]
+        self.run_action(
+            'post', 'move_to_group', selected, group=self.group.pk
+        )
+        self.assertEqual(
+            Post.objects.filter(group=self.group).count(), len(selected)
+        )
+        self.assertIsNone(Post.objects.get(pk=self.post.pk).group)
+
+    def test_move_without_group_choice_refused(self):
+        """Без группы и без «Без группы» записи остаются на месте"""
+        self.post.group = self.group
+        self.post.save()
+        for data in ({}, {'group': 0}):
+            self.run_action('post', 'move_to_group', [self.post.pk], **data)
+            self.assertEqual(Post.objects.get(pk=self.post.pk).group,
+                             self.group)
+        self.run_action(
+            'post', 'move_to_group', [self.post.pk], ungroup='on'
+        )
+        self.assertIsNone(Post.objects.get(pk=self.post.pk).group)
+
+    def test_purge_comments_without_dates_only_selected(self):
+        """Без дат удаляются только выбранные комментарии"""
+        self.run_action('comment', 'purge_date_range', [self.kept.pk])
+        self.assertFalse(Comment.objects.filter(pk=self.kept.pk).exists())
+        self.assertEqual(Comment.objects.count(), 2)
+
+    def test_purge_comments_by_dates(self):
+        """Комментарии за указанный период удаляются целиком"""
+        today = timezone.now().date()
+        self.run_action(
+            'comment', 'purge_date_range', [self.kept.pk],
+            date_from=today, date_to=today,
+        )
+        self.assertFalse(Comment.objects.exists())
+
+    def test_purge_comments_outside_range_kept(self):
+        """Комментарии вне указанного периода остаются"""
+        self.run_action(
+            'comment', 'purge_date_range', [self.kept.pk],
+            date_from='2000-01-01', date_to='2000-12-31',
+        )
+        self.assertEqual(Comment.objects.count(), 3)
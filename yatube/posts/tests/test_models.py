@@ -1,7 +1,28 @@
+import shutil
+from io import StringIO
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
 from django.test import TestCase
+from django.urls import reverse
+
+from core.fields import excerpt
+from ..models import Comment, Group, Post, User
+from ..const import EXCERPTLIM, TEXTLIM
+from ..images import get_variants
 
-from ..models import Group, Post, User
-from ..const import TEXTLIM
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
 
 
 class PostModelTest(TestCase):
@@ -36,3 +57,190 @@ class PostModelTest(TestCase):
         for text, expected_name in title:
             with self.subTest(expected_name=text):
                 self.assertEqual(expected_name, str(text))
+
+
+class PostImageStorageTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.user = User.objects.create_user(username='uploader')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def upload(self):
+        return SimpleUploadedFile(
+            name='meme.gif', content=SMALL_GIF, content_type='image/gif'
+        )
+
+    def test_same_image_stored_once(self):
+        """Одинаковые картинки хранятся одним файлом до последней ссылки"""
+        first = Post.objects.create(
+            author=self.user, text='Первый', image=self.upload()
+        )
+        second = Post.objects.create(
+            author=self.user, text='Второй', image=self.upload()
+        )
+        self.assertEqual(first.image.name, second.image.name)
+        storage = first.image.storage
+        first.delete()
+        second.hard_delete()
+        # Помеченный удалённым пост держит файл до окончательного удаления.
+        self.assertTrue(storage.exists(second.image.name))
+        first.hard_delete()
+        self.assertFalse(storage.exists(second.image.name))
+
+    def test_image_restored_after_concurrent_release(self):
+        """Файл, стёртый одновременным удалением, пишется заново"""
+        first = Post.objects.create(
+            author=self.user, text='Первый', image=self.upload()
+        )
+        storage = first.image.storage
+        save = storage.save
+
+        def save_then_release(name, content, max_length=None):
+            # Файл уже есть, save его не пишет; в этот момент другой
+            # запрос стирает последний пост с этой картинкой.
+            stored = save(name, content, max_length)
+            first.hard_delete()
+            return stored
+
+        # TestCase не коммитит транзакцию: колбэки вызываем сами.
+        with mock.patch.object(storage, 'save', save_then_release), \
+                mock.patch.object(transaction, 'on_commit') as on_commit:
+            second = Post.objects.create(
+                author=self.user, text='Второй', image=self.upload()
+            )
+        self.assertFalse(storage.exists(second.image.name))
+        for (callback,), _ in on_commit.call_args_list:
+            callback()
+        self.assertTrue(storage.exists(second.image.name))
+        second.hard_delete()
+
+    def test_variants_built_once_and_released(self):
+        """Варианты для srcset строятся из картинки и удаляются с ней"""
+        post = Post.objects.create(
+            author=self.user, text='С картинкой', image=self.upload()
+        )
+        variants = get_variants(post.image)
+        self.assertEqual(
+            [width for _, width in variants['jpeg']],
+            sorted(settings.IMAGE_VARIANT_WIDTHS)
+        )
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        )
+        self.assertContains(response, variants['webp'][0][0])
+        storage = post.image.storage
+        variant = variants['jpeg'][0][0][len(settings.MEDIA_URL):]
+        self.assertTrue(storage.exists(variant))
+        post.hard_delete()
+        self.assertFalse(storage.exists(variant))
+
+
+class SoftDeleteTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='author')
+        self.post = Post.objects.create(author=self.user, text='Запись')
+        self.comment = Comment.objects.create(
+            post=self.post, author=self.user, text='Комментарий'
+        )
+
+    def test_deleted_rows_hidden(self):
+        """Удалённые записи и комментарии скрыты менеджером по умолчанию"""
+        self.comment.delete()
+        self.assertFalse(self.post.comments.exists())
+        Post.objects.filter(pk=self.post.pk).delete()
+        self.assertFalse(Post.objects.exists())
+        self.assertTrue(Post.all_objects.filter(pk=self.post.pk).exists())
+        self.assertEqual(Comment.all_objects.count(), 1)
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_purge_deleted_in_batches(self):
+        """purge_deleted стирает помеченные строки вместе с комментариями"""
+        kept = Post.objects.create(author=self.user, text='Остаётся')
+        for i in range(4):
+            Post.objects.create(author=self.user, text=f'Лишняя {i}')
+        Post.objects.exclude(pk=kept.pk).delete()
+        call_command(
+            'purge_deleted', batch_size=2, older_than=0, pause=0,
+            stdout=StringIO()
+        )
+        self.assertEqual(
+            list(Post.all_objects.values_list('pk', flat=True)), [kept.pk]
+        )
+        self.assertFalse(Comment.all_objects.exists())
+
+    def test_purge_keeps_recent(self):
+        """Недавно удалённые строки ещё можно восстановить"""
+        self.post.delete()
+        call_command('purge_deleted', pause=0, stdout=StringIO())
+        self.assertTrue(Post.all_objects.filter(pk=self.post.pk).exists())
+
+
+class PostExcerptTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='writer')
+        cls.long_text = 'слово ' * EXCERPTLIM
+
+    def test_excerpt_cut_by_words(self):
+        """Начало длинного текста обрезается по границе слова"""
+        post = Post.objects.create(author=self.user, text=self.long_text)
+        self.assertLessEqual(len(post.excerpt), EXCERPTLIM + 1)
+        self.assertTrue(post.excerpt.endswith('слово…'))
+        self.assertTrue(post.is_truncated)
+        short = Post.objects.create(author=self.user, text='Коротко')
+        self.assertEqual(short.excerpt, 'Коротко')
+        self.assertFalse(short.is_truncated)
+
+    def test_excerpt_cut_at_line_break(self):
+        """Перенос строки — тоже граница слова"""
+        self.assertEqual(excerpt('alpha\nbetaword gamma', 8), 'alpha…')
+
+    def test_text_ending_with_ellipsis_not_truncated(self):
+        """Короткий текст с «…» на конце не считается обрезанным"""
+        post = Post.objects.create(author=self.user, text='Ну что ж…')
+        self.assertEqual(post.excerpt, 'Ну что ж…')
+        self.assertFalse(post.is_truncated)
+
+    def test_excerpt_filled_by_bulk_create(self):
+        """bulk_create тоже заполняет начало текста"""
+        Post.objects.bulk_create([
+            Post(author=self.user, text=self.long_text) for _ in range(2)
+        ])
+        self.assertFalse(Post.objects.filter(excerpt='').exists())
+
+
+class RenderedTextTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='formatter')
+
+    def test_rendered_on_save(self):
+        """HTML текста сохраняется вместе с записью и комментарием"""
+        post = Post.objects.create(author=self.user, text='Привет #мир')
+        comment = Comment.objects.create(
+            post=post, author=self.user, text='<b>@formatter</b>'
+        )
+        self.assertIn('class="hashtag"', post.text_html)
+        self.assertIn('class="mention"', comment.text_html)
+        self.assertNotIn('<b>', comment.text_html)
+        post.text = 'Другой текст'
+        post.save()
+        self.assertEqual(post.text_html, '<p>Другой текст</p>')
+
+    def test_backfill_renders_missing(self):
+        """render_texts дорисовывает строки без HTML"""
+        post = Post.objects.create(author=self.user, text='Старая запись')
+        Post.objects.filter(pk=post.pk).update(text_html='', text_hash='')
+        call_command('render_texts', batch_size=1, stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, '<p>Старая запись</p>')
+        self.assertTrue(post.text_hash)
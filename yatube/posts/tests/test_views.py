@@ -1,14 +1,24 @@
 import tempfile
 import shutil
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+from unittest import mock
 
-from django.test import TestCase, Client
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
 from django import forms
 
-from ..models import Group, Post, Follow, User
+from ..const import POSTLIM
+from ..models import ArchivedPost, Comment, Group, Post, Follow, Tag, User
+from .. import comment_queue, feeds
 
 
 class PostURLTests(TestCase):
@@ -253,3 +263,385 @@ class FollowTests(TestCase):
         )
         response = self.client_auth_following.get('/follow/')
         self.assertNotEqual(response, 'Какая-то запись для тестов')
+
+
+@override_settings(RATELIMITS={'add_comment': (2, 60)})
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='spammer')
+        self.client_auth = Client()
+        self.client_auth.force_login(self.user)
+        self.post = Post.objects.create(author=self.user, text='Запись')
+
+    def test_add_comment_rate_limited(self):
+        """Лишние комментарии отклоняются со статусом 429"""
+        url = reverse('posts:add_comment', kwargs={'post_id': self.post.pk})
+        for _ in range(2):
+            response = self.client_auth.post(url, data={'text': 'коммент'})
+            self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        response = self.client_auth.post(url, data={'text': 'коммент'})
+        self.assertEqual(
+            response.status_code, HTTPStatus.TOO_MANY_REQUESTS
+        )
+        self.assertEqual(self.post.comments.count(), 2)
+
+
+class CommentWriteBehindTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.queue_dir = tempfile.mkdtemp()
+        self.user = User.objects.create(username='commenter')
+        self.client_auth = Client()
+        self.client_auth.force_login(self.user)
+        self.post = Post.objects.create(author=self.user, text='Запись')
+
+    def tearDown(self):
+        shutil.rmtree(self.queue_dir, ignore_errors=True)
+
+    def test_comment_queued_and_flushed(self):
+        """Комментарий из очереди виден автору и сохраняется при сбросе"""
+        queue_path = f'{self.queue_dir}/queue.jsonl'
+        with self.settings(COMMENTS_WRITE_BEHIND=True,
+                           COMMENT_QUEUE_PATH=queue_path):
+            self.client_auth.post(
+                reverse('posts:add_comment',
+                        kwargs={'post_id': self.post.pk}),
+                data={'text': 'отложенный коммент'}
+            )
+            self.assertEqual(self.post.comments.count(), 0)
+            detail = reverse('posts:post_detail',
+                             kwargs={'post_id': self.post.pk})
+            response = self.client_auth.get(detail)
+            self.assertContains(response, 'отложенный коммент')
+            self.assertEqual(comment_queue.flush(), 1)
+            self.assertEqual(self.post.comments.count(), 1)
+            response = self.client_auth.get(detail)
+            self.assertContains(response, 'отложенный коммент', count=1)
+
+    def test_flush_repeated_after_crash(self):
+        """Повторный сброс после сбоя не дублирует комментарии"""
+        queue_path = f'{self.queue_dir}/queue.jsonl'
+        with self.settings(COMMENT_QUEUE_PATH=queue_path):
+            comment_queue.enqueue(self.post.pk, self.user, 'первый')
+            comment_queue.enqueue(self.post.pk, self.user, 'второй')
+            queued = [
+                c.created for c in comment_queue.pending_comments(
+                    self.post, self.user, []
+                )
+            ]
+            with mock.patch.object(comment_queue.os, 'remove',
+                                   side_effect=OSError):
+                with self.assertRaises(OSError):
+                    comment_queue.flush()
+            self.assertEqual(comment_queue.flush(), 0)
+        self.assertEqual(
+            sorted(self.post.comments.values_list('created', flat=True)),
+            sorted(queued),
+        )
+        self.assertNotIn('', self.post.comments.values_list(
+            'text_html', flat=True
+        ))
+
+    def test_flush_keeps_later_pending(self):
+        """Комментарий, добавленный во время сброса, остаётся виден"""
+        queue_path = f'{self.queue_dir}/queue.jsonl'
+        take_batch = comment_queue._take_batch
+
+        def take_then_enqueue(path):
+            processing = take_batch(path)
+            comment_queue.enqueue(self.post.pk, self.user, 'поздний')
+            return processing
+
+        with self.settings(COMMENT_QUEUE_PATH=queue_path):
+            comment_queue.enqueue(self.post.pk, self.user, 'ранний')
+            with mock.patch.object(comment_queue, '_take_batch',
+                                   take_then_enqueue):
+                self.assertEqual(comment_queue.flush(), 1)
+            pending = comment_queue.pending_comments(
+                self.post, self.user, list(self.post.comments.all())
+            )
+        self.assertEqual([c.text for c in pending], ['поздний'])
+
+
+class PostCardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='card_author')
+        self.post = Post.objects.create(author=self.user, text='Старый текст')
+        self.url = reverse(
+            'posts:profile', kwargs={'username': self.user.username}
+        )
+
+    def test_card_rendered_once_per_version(self):
+        """Карточка берётся из кэша, пока пост не изменён"""
+        self.assertContains(self.client.get(self.url), 'Старый текст')
+        Post.objects.filter(pk=self.post.pk).update(text='Новый текст')
+        self.assertContains(self.client.get(self.url), 'Старый текст')
+        self.post.text = 'Новый текст'
+        self.post.save()
+        self.assertContains(self.client.get(self.url), 'Новый текст')
+
+    def test_card_follows_author_and_group_changes(self):
+        """Новое имя автора и слаг группы видны без сохранения поста"""
+        group = Group.objects.create(title='Карточки', slug='old-slug')
+        self.post.group = group
+        self.post.save()
+        self.client.get(self.url)
+        self.user.first_name, self.user.last_name = 'Новое', 'Имя'
+        self.user.save()
+        group.slug = 'new-slug'
+        group.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Автор: Новое Имя')
+        self.assertContains(
+            response, reverse('posts:group_list', args=['new-slug'])
+        )
+
+
+class PostExcerptListingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='long_writer')
+        self.post = Post.objects.create(
+            author=self.user, text='начало ' * 100 + 'КОНЕЦ'
+        )
+
+    def test_listing_shows_excerpt_only(self):
+        """В ленте только начало текста и ссылка на полный пост"""
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'читать дальше')
+        self.assertNotContains(response, 'КОНЕЦ')
+        post = response.context['page_obj'][0]
+        self.assertLessEqual(
+            {'text', 'text_html'}, post.get_deferred_fields()
+        )
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+        self.assertContains(response, 'КОНЕЦ')
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='archivist')
+        self.client_auth = Client()
+        self.client_auth.force_login(self.user)
+        for i in range(POSTLIM + 3):
+            Post.objects.create(author=self.user, text=f'Запись {i}')
+        self.old = list(Post.objects.order_by('created')[:5])
+        for age, post in enumerate(reversed(self.old), start=400):
+            Post.objects.filter(pk=post.pk).update(
+                created=timezone.now() - timedelta(days=age)
+            )
+        Comment.objects.create(
+            post=self.old[0], author=self.user, text='Старый коммент'
+        )
+        self.expected = list(Post.objects.values_list('pk', flat=True))
+        call_command('archive_posts', pause=0, stdout=StringIO())
+
+    def test_old_posts_moved(self):
+        """Старые записи и комментарии переезжают в архив"""
+        self.assertEqual(Post.objects.count(), POSTLIM + 3 - len(self.old))
+        self.assertEqual(ArchivedPost.objects.count(), len(self.old))
+        self.assertEqual(
+            ArchivedPost.objects.get(pk=self.old[0].pk).comments.count(), 1
+        )
+        self.assertFalse(Comment.all_objects.exists())
+
+    def test_listing_continues_into_archive(self):
+        """Пагинация продолжается архивом в прежнем порядке"""
+        shown = []
+        for page in (1, 2):
+            response = self.client.get(
+                reverse('posts:profile',
+                        kwargs={'username': self.user.username}),
+                {'page': page}
+            )
+            shown += [post.pk for post in response.context['page_obj']]
+        self.assertEqual(shown, self.expected)
+        self.assertEqual(
+            response.context['page_obj'].paginator.count, len(self.expected)
+        )
+
+    def test_hot_page_does_not_read_archive(self):
+        """Страница из горячих записей не обращается к архиву"""
+        for i in range(POSTLIM):
+            Post.objects.create(author=self.user, text=f'Новая {i}')
+        for name, kwargs in (
+            ('posts:index', {}),
+            ('posts:profile', {'username': self.user.username}),
+        ):
+            with self.subTest(name=name):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(reverse(name, kwargs=kwargs))
+                self.assertFalse([
+                    query for query in context.captured_queries
+                    if 'archivedpost' in query['sql']
+                ])
+                self.assertEqual(
+                    response.context['page_obj'].paginator.count,
+                    len(self.expected) + POSTLIM
+                )
+
+    def test_archived_post_detail(self):
+        """Архивная запись открывается только для чтения"""
+        response = self.client_auth.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.old[0].pk})
+        )
+        self.assertContains(response, 'Старый коммент')
+        self.assertNotContains(response, 'Добавить комментарий')
+        response = self.client_auth.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.old[0].pk}),
+            data={'text': 'Новый'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class TagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='tagger')
+        self.posts = [
+            Post.objects.create(author=self.user, text=f'#Python запись {i}')
+            for i in range(POSTLIM + 2)
+        ]
+        self.url = reverse('posts:tag_posts', kwargs={'name': 'python'})
+
+    def tag(self):
+        return Tag.objects.get(name='#python')
+
+    def test_tags_extracted_and_counted(self):
+        """Теги достаются из текста, счётчик следует за правками"""
+        self.assertEqual(self.tag().post_count, POSTLIM + 2)
+        post = self.posts[0]
+        post.text = 'Без тега, но для @tagger'
+        post.save()
+        self.assertEqual(self.tag().post_count, POSTLIM + 1)
+        self.assertEqual(Tag.objects.get(name='@tagger').post_count, 1)
+        self.posts[1].delete()
+        self.assertEqual(self.tag().post_count, POSTLIM)
+
+    def test_tag_page_paginated_without_count(self):
+        """Страница тега листается по денормализованному счётчику"""
+        shown = []
+        for page in (1, 2):
+            response = self.client.get(self.url, {'page': page})
+            shown += [post.pk for post in response.context['page_obj']]
+        self.assertEqual(shown, [post.pk for post in reversed(self.posts)])
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url)
+        self.assertFalse(
+            [q for q in context.captured_queries if 'COUNT(' in q['sql']]
+        )
+
+    def test_archived_posts_stay_on_tag_page(self):
+        """Архивные записи остаются в конце ленты тега"""
+        old = self.posts[0]
+        Post.objects.filter(pk=old.pk).update(
+            created=timezone.now() - timedelta(days=400)
+        )
+        call_command('archive_posts', pause=0, stdout=StringIO())
+        self.assertEqual(self.tag().archived_count, 1)
+        response = self.client.get(self.url, {'page': 2})
+        self.assertEqual(
+            [post.pk for post in response.context['page_obj']][-1], old.pk
+        )
+        self.assertIsInstance(
+            response.context['page_obj'][-1], ArchivedPost
+        )
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='feed_author')
+        self.group = Group.objects.create(
+            title='Лента', slug='feed-slug', description='Описание'
+        )
+        Post.objects.create(
+            author=self.user, group=self.group, text='Запись в ленте'
+        )
+
+    def test_feeds_available(self):
+        """Ленты отдают последние записи"""
+        urls = (
+            reverse('posts:rss'),
+            reverse('posts:atom'),
+            reverse('posts:group_rss', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile_atom',
+                    kwargs={'username': self.user.username}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), 'Запись в ленте')
+
+    def test_feed_not_modified_without_queries(self):
+        """Ответ 304 не обращается к БД, новая запись сбрасывает ленту"""
+        url = reverse('posts:group_rss', kwargs={'slug': self.group.slug})
+        last_modified = self.client.get(url)['Last-Modified']
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        Post.objects.create(
+            author=self.user, group=self.group, text='Свежая запись'
+        )
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertContains(response, 'Свежая запись')
+
+    def test_unknown_scope_not_found(self):
+        """Лента неизвестной группы — 404 без метки в кэше"""
+        url = reverse('posts:group_rss', kwargs={'slug': 'missing'})
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2035 00:00:00 GMT'
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertIsNone(cache.get(feeds.stamp_key('group:missing')))
+
+
+@override_settings(SSE_HOLD_SECONDS=0)
+class PostEventsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='events_author')
+
+    def read_stream(self, **headers):
+        response = self.client.get(reverse('posts:post_events'), **headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = b''.join(response.streaming_content).decode()
+        response.close()
+        return stream
+
+    def test_new_posts_event(self):
+        """Поток сообщает о записях после Last-Event-ID"""
+        self.assertIn('id: 0', self.read_stream())
+        Post.objects.create(author=self.user, text='Первая')
+        Post.objects.create(author=self.user, text='Вторая')
+        stream = self.read_stream(HTTP_LAST_EVENT_ID='0')
+        self.assertIn('event: posts', stream)
+        self.assertIn('"new": 2', stream)
+
+    @override_settings(SSE_MAX_STREAMS=1)
+    def test_streams_are_capped(self):
+        """Сверх SSE_MAX_STREAMS клиент получает только retry"""
+        held = self.client.get(reverse('posts:post_events'))
+        busy = self.read_stream()
+        self.assertIn(f'retry: {settings.SSE_BUSY_RETRY_MS}', busy)
+        self.assertNotIn('id:', busy)
+        held.close()
+        self.assertIn('id: 0', self.read_stream())
+
+    def test_pages_subscribe_to_events(self):
+        """Лента и группа подключают EventSource к своему каналу"""
+        group = Group.objects.create(title='События', slug='events')
+        events_url = reverse('posts:post_events')
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'new EventSource')
+        self.assertContains(response, f"'{events_url}'")
+        response = self.client.get(
+            reverse('posts:group_list', args=[group.slug])
+        )
+        self.assertContains(response, f"'{events_url}?group=events'")
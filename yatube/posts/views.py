@@ -1,14 +1,26 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, StreamingHttpResponse
+from django.conf import settings
 from django.urls import reverse
 
-from .models import Post, Group, Follow, User
+from core.decorators import ratelimit
+from notifications import inbox
+from notifications.models import Notification
+
+from .archive import archived_count, get_post_or_404, listing
+from .models import ArchivedPost, Post, Group, Follow, Tag, User
 from .forms import PostForm, CommentForm
 from .utils import get_page_context
+from . import comment_queue, events, tags
 
 
 def index(request):
-    post_list = Post.objects.select_related('author')
+    post_list = listing(
+        Post.objects.all(),
+        ArchivedPost.objects.all(),
+        counts=(None, archived_count(['index'])),
+    )
     context = {
         'page_obj': get_page_context(post_list, request),
     }
@@ -17,7 +29,11 @@ def index(request):
 
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    posts = group.group_posts.all()
+    posts = listing(
+        group.group_posts.all(),
+        group.archived_posts.all(),
+        counts=(None, archived_count([f'group:{group.pk}'])),
+    )
     context = {
         'group': group,
         'posts': posts,
@@ -26,9 +42,29 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+def tag_posts(request, name):
+    """Записи с тегом: чтение по индексу (tag, created), без COUNT(*)."""
+    tag = get_object_or_404(Tag, name=tags.tag_name(name))
+    order = '-post_tags__created'
+    posts = listing(
+        Post.objects.filter(post_tags__tag=tag).order_by(order),
+        ArchivedPost.objects.filter(post_tags__tag=tag).order_by(order),
+        counts=(tag.post_count - tag.archived_count, tag.archived_count),
+    )
+    context = {
+        'tag': tag,
+        'page_obj': get_page_context(posts, request),
+    }
+    return render(request, 'posts/tag_list.html', context)
+
+
 def profile(request, username):
     author = get_object_or_404(User, username=username)
-    posts = Post.objects.filter(author=author)
+    posts = listing(
+        author.posts.all(),
+        author.archived_posts.all(),
+        counts=(None, archived_count([f'author:{author.pk}'])),
+    )
     context = {
         'author': author,
         'posts': posts,
@@ -38,9 +74,14 @@ def profile(request, username):
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_post_or_404(post_id)
     form = CommentForm(request.POST or None)
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
+    if settings.COMMENTS_WRITE_BEHIND and not post.is_archived:
+        comments = list(comments)
+        comments += comment_queue.pending_comments(
+            post, request.user, comments
+        )
     context = {
         'post': post,
         'form': form,
@@ -50,6 +91,7 @@ def post_detail(request, post_id):
 
 
 @login_required
+@ratelimit('post_create', methods=('POST',))
 def post_create(request):
     form = PostForm(
         request.POST or None,
@@ -86,20 +128,39 @@ def post_edit(request, post_id):
 
 
 @login_required
+@ratelimit('add_comment')
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
     form = CommentForm(request.POST or None)
+    if settings.COMMENTS_WRITE_BEHIND:
+        if not Post.objects.filter(pk=post_id).exists():
+            raise Http404
+        if form.is_valid():
+            comment_queue.enqueue(
+                post_id, request.user, form.cleaned_data['text']
+            )
+        return redirect('posts:post_detail', post_id=post_id)
+    post = get_object_or_404(Post, pk=post_id)
     if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
         comment.save()
+        inbox.comments_posted([comment])
     return redirect('posts:post_detail', post_id=post_id)
 
 
 @login_required
 def follow_index(request):
-    post_list = Post.objects.filter(author__following__user=request.user)
+    authors = Follow.objects.filter(
+        user=request.user
+    ).values_list('author_id', flat=True)
+    post_list = listing(
+        Post.objects.filter(author__following__user=request.user),
+        ArchivedPost.objects.filter(author__following__user=request.user),
+        counts=(None, archived_count(
+            [f'author:{author_id}' for author_id in authors]
+        )),
+    )
     context = {
         'page_obj': get_page_context(post_list, request)
     }
@@ -107,10 +168,15 @@ def follow_index(request):
 
 
 @login_required
+@ratelimit('profile_follow')
 def profile_follow(request, username):
     author = get_object_or_404(User, username=username)
     if request.user != author:
-        Follow.objects.get_or_create(user=request.user, author=author)
+        _, created = Follow.objects.get_or_create(
+            user=request.user, author=author
+        )
+        if created:
+            inbox.notify(Notification.FOLLOW, request.user, [author.pk])
     return redirect(reverse('posts:profile', args=[username]))
 
 
@@ -121,3 +187,36 @@ def profile_unfollow(request, username):
     if following.exists():
         following.delete()
     return redirect('posts:profile', username)
+
+
+def post_events(request):
+    """Поток SSE с числом новых записей.
+
+    Канал выбирается параметрами: ?group=<slug>, ?follow=1 (авторы,
+    на которых подписан пользователь) или общая лента по умолчанию.
+    """
+    if 'group' in request.GET:
+        group = get_object_or_404(Group, slug=request.GET['group'])
+        channels = [f'group:{group.pk}']
+    elif 'follow' in request.GET and request.user.is_authenticated:
+        channels = [
+            f'author:{pk}' for pk in Follow.objects.filter(
+                user=request.user
+            ).values_list('author_id', flat=True)
+        ]
+    else:
+        channels = ['index']
+    since = request.META.get('HTTP_LAST_EVENT_ID')
+    since = int(since) if since and since.isdigit() else None
+    slot = events.open_stream()
+    response = StreamingHttpResponse(
+        events.event_stream(channels, since) if slot
+        else events.busy_stream(),
+        content_type='text/event-stream',
+    )
+    if slot:
+        # Место освобождается, когда сервер закрывает ответ.
+        response._closable_objects.append(slot)
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
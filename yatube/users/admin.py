@@ -0,0 +1,33 @@
+from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
+
+from posts.models import Comment, Post
+from . import deletion
+from .models import User
+
+
+class DeferredDeleteUserAdmin(UserAdmin):
+    """Удаление пользователя откладывает стирание его содержимого."""
+
+    def get_deleted_objects(self, objs, request):
+        # Каскад не собирается целиком: для страницы подтверждения
+        # достаточно числа записей и комментариев.
+        ids = [obj.pk for obj in objs]
+        model_count = {
+            User._meta.verbose_name_plural: len(ids),
+            Post._meta.verbose_name_plural:
+                Post.objects.filter(author__in=ids).count(),
+            Comment._meta.verbose_name_plural:
+                Comment.objects.filter(author__in=ids).count(),
+        }
+        return [str(obj) for obj in objs], model_count, set(), []
+
+    def delete_model(self, request, obj):
+        deletion.delete_users([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        deletion.delete_users(queryset.values_list('pk', flat=True))
+
+
+admin.site.unregister(User)
+admin.site.register(User, DeferredDeleteUserAdmin)
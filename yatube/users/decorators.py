@@ -0,0 +1,40 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+
+from core.decorators import client_ip, is_rate_limited, too_many_requests
+
+
+def login_throttled(request, username):
+    """Засчитывает попытку входа; ответ 429, если лимит исчерпан."""
+    username = (username or '').strip().casefold()
+    idents = (
+        ('login_ip', client_ip(request)),
+        # Имя хэшируется: в ключе кэша только безопасные символы.
+        ('login_username', username and hashlib.sha256(
+            username.encode('utf-8')
+        ).hexdigest()),
+    )
+    for scope, ident in idents:
+        limit, period = settings.RATELIMITS[scope]
+        if ident and is_rate_limited(f'{scope}:{ident}', limit, period):
+            return too_many_requests(period)
+    return None
+
+
+def throttle_login(view_func):
+    """Ограничивает попытки входа с одного IP и на одно имя пользователя.
+
+    Проверка идёт до формы входа, то есть до хэширования пароля: перебор
+    паролей упирается в счётчики в кэше, а не в CPU воркеров. Лимиты —
+    RATELIMITS['login_ip'] и RATELIMITS['login_username'].
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method == 'POST':
+            response = login_throttled(request, request.POST.get('username'))
+            if response is not None:
+                return response
+        return view_func(request, *args, **kwargs)
+    return wrapper
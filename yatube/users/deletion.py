@@ -0,0 +1,46 @@
+"""Удаление пользователей без длинного каскада.
+
+Обычный User.delete() собирает и стирает все записи, комментарии и
+теги пользователя в одной транзакции, по сигналам на каждую запись, и
+держит блокировку SQLite. Здесь удаление идёт тем же путём, что и
+модерация: содержимое помечается удалёнными несколькими UPDATE, а
+строки стирает purge_deleted пачками.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+from posts import moderation
+from posts.models import Comment, Post
+from .backends import user_cache_key
+from .models import PendingDeletion, User
+
+
+def delete_users(user_ids):
+    """Отключает пользователей и помечает удалённым их содержимое."""
+    user_ids = list(user_ids)
+    with transaction.atomic():
+        moderation.delete_authors_content(user_ids)
+        User.objects.filter(pk__in=user_ids).update(is_active=False)
+        PendingDeletion.objects.bulk_create(
+            [PendingDeletion(user_id=pk) for pk in user_ids],
+            ignore_conflicts=True,
+        )
+    # update() не шлёт сигналов: снимки сессий сбрасываем сами.
+    cache.delete_many([user_cache_key(pk) for pk in user_ids])
+
+
+def purge_users(before):
+    """Стирает пользователей, удалённых не позже before.
+
+    Пользователь ждёт, пока purge_deleted не сотрёт всё его содержимое.
+    Возвращает число стёртых пользователей.
+    """
+    pending = PendingDeletion.objects.filter(
+        requested__lte=before
+    ).exclude(
+        user__in=Post.all_objects.values('author')
+    ).exclude(
+        user__in=Comment.all_objects.values('author')
+    ).values('user')
+    deleted, per_model = User.objects.filter(pk__in=pending).delete()
+    return per_model.get(User._meta.label, 0)
@@ -0,0 +1,85 @@
+"""PBKDF2 в ограниченном пуле потоков с замером времени.
+
+Хэш пароля считается в отдельном ThreadPoolExecutor на
+settings.PASSWORD_HASH_WORKERS потоков: сколько бы входов ни пришло
+одновременно, PBKDF2 (hashlib отпускает GIL) занимает не больше этого
+числа ядер, остальные запросы ждут в очереди пула, не расходуя CPU, и не
+мешают чтению. Формат хэшей и число итераций — как у Django, поэтому
+сохранённые пароли проверяются без миграции.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class HashStats:
+    """Счётчики времени хэширования в этом процессе."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.wait = 0.0
+            self.run = 0.0
+            self.max_run = 0.0
+
+    def record(self, wait, run):
+        with self._lock:
+            self.count += 1
+            self.wait += wait
+            self.run += run
+            self.max_run = max(self.max_run, run)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'count': self.count,
+                'wait_seconds': self.wait,
+                'run_seconds': self.run,
+                'max_run_seconds': self.max_run,
+            }
+
+
+stats = HashStats()
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix='password-hash',
+            )
+        return _executor
+
+
+class BoundedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    def encode(self, password, salt, iterations=None):
+        queued = time.perf_counter()
+        return executor().submit(
+            self._timed_encode, queued, password, salt, iterations
+        ).result()
+
+    def _timed_encode(self, queued, password, salt, iterations):
+        started = time.perf_counter()
+        encoded = super().encode(password, salt, iterations)
+        finished = time.perf_counter()
+        stats.record(started - queued, finished - started)
+        logger.debug(
+            'password hash: wait %.1f ms, run %.1f ms',
+            (started - queued) * 1000, (finished - started) * 1000,
+        )
+        return encoded
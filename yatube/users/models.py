@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+class PendingDeletion(models.Model):
+    """Пользователь, удалённый из админки, но ещё не стёртый.
+
+    Его записи и комментарии помечены удалёнными, сам он отключён
+    (is_active=False). Строку пользователя стирает purge_deleted, когда
+    его содержимое уже стёрто пачками, и каскад остаётся маленьким.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='pending_deletion'
+    )
+    requested = models.DateTimeField('Запрошено', auto_now_add=True)
+
+    def __str__(self):
+        return str(self.user)
@@ -0,0 +1,54 @@
+from django.contrib.auth import BACKEND_SESSION_KEY, get_user_model
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from ..hashers import stats
+
+User = get_user_model()
+
+
+class CachedSessionUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='cached', password='old-pass-123'
+        )
+        self.client_auth = Client()
+        self.client_auth.login(username='cached', password='old-pass-123')
+        self.url = reverse('about:author')
+
+    def test_logged_in_request_without_queries(self):
+        """Сессия и пользователь берутся из кэша"""
+        self.client_auth.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client_auth.get(self.url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_password_change_invalidates_snapshot(self):
+        """После смены пароля старая сессия недействительна"""
+        self.client_auth.get(self.url)
+        self.user.set_password('new-pass-456')
+        self.user.save()
+        response = self.client_auth.get(self.url)
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_old_session_backend_still_accepted(self):
+        """Сессии, открытые через ModelBackend, остаются действительными"""
+        client = Client()
+        client.login(username='cached', password='old-pass-123')
+        session = client.session
+        session[BACKEND_SESSION_KEY] = (
+            'django.contrib.auth.backends.ModelBackend'
+        )
+        session.save()
+        response = client.get(self.url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_failed_login_hashed_once(self):
+        """Неверный пароль не проверяется вторым бэкендом заново"""
+        stats.reset()
+        self.assertFalse(
+            Client().login(username='cached', password='wrong-pass')
+        )
+        self.assertEqual(stats.snapshot()['count'], 1)
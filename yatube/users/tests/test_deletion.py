@@ -0,0 +1,62 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Post
+from ..models import PendingDeletion
+
+User = get_user_model()
+
+
+class UserDeletionTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'admin-pass'
+        )
+        self.admin_client = Client()
+        self.admin_client.force_login(admin)
+        self.reader = User.objects.create_user(username='reader')
+
+    def make_author(self, username, posts):
+        author = User.objects.create_user(username=username)
+        for i in range(posts):
+            post = Post.objects.create(author=author, text=f'Запись {i}')
+            Comment.objects.create(post=post, author=self.reader, text='-')
+            Comment.objects.create(post=post, author=author, text='-')
+        return author
+
+    def delete_in_admin(self, user):
+        with CaptureQueriesContext(connection) as context:
+            self.admin_client.post(
+                reverse('admin:auth_user_delete', args=[user.pk]),
+                {'post': 'yes'},
+            )
+        return len(context)
+
+    def test_delete_queries_do_not_grow_with_content(self):
+        """Удаление пользователя не обходит его записи по одной"""
+        # Первый запрос прогревает сессию и кэши админки.
+        self.delete_in_admin(self.make_author('warmup', 1))
+        small = self.delete_in_admin(self.make_author('small', 1))
+        large = self.delete_in_admin(self.make_author('large', 20))
+        self.assertEqual(small, large)
+        self.assertLess(large, 30)
+
+    def test_content_hidden_then_purged_with_user(self):
+        """Содержимое скрыто сразу, пользователь стирается после него"""
+        author = self.make_author('author', 3)
+        self.delete_in_admin(author)
+        author.refresh_from_db()
+        self.assertFalse(author.is_active)
+        self.assertFalse(Post.objects.filter(author=author).exists())
+        self.assertFalse(Comment.objects.filter(post__author=author).exists())
+        self.assertTrue(PendingDeletion.objects.filter(user=author).exists())
+        call_command('purge_deleted', older_than=0, pause=0, stdout=StringIO())
+        self.assertFalse(User.objects.filter(pk=author.pk).exists())
+        self.assertFalse(Post.all_objects.filter(author=author).exists())
+        self.assertTrue(User.objects.filter(pk=self.reader.pk).exists())
@@ -0,0 +1,81 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..hashers import BoundedPBKDF2PasswordHasher, stats
+
+User = get_user_model()
+
+RATELIMITS = dict(
+    settings.RATELIMITS, login_ip=(3, 60), login_username=(2, 60)
+)
+
+
+@override_settings(RATELIMITS=RATELIMITS)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        stats.reset()
+        User.objects.create_user(username='victim', password='secret-123')
+        self.url = reverse('users:login')
+
+    def attempt(self, username, ip, **headers):
+        return self.client.post(
+            self.url,
+            {'username': username, 'password': 'guess'},
+            REMOTE_ADDR=ip,
+            **headers,
+        )
+
+    def test_username_throttled_across_ips(self):
+        """Перебор одного имени с разных IP упирается в лимит до хэша"""
+        for ip in ('10.0.0.1', '10.0.0.2'):
+            self.assertEqual(self.attempt('victim', ip).status_code,
+                             HTTPStatus.OK)
+        hashed = stats.snapshot()['count']
+        response = self.attempt('Victim', '10.0.0.3')
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(stats.snapshot()['count'], hashed)
+
+    def test_ip_throttled_across_usernames(self):
+        """Много имён с одного IP тоже ограничиваются"""
+        # До конца минутного окна остаётся 15 секунд.
+        with mock.patch('core.decorators.time.time', return_value=6045.0):
+            for i in range(3):
+                self.attempt(f'user{i}', '10.0.0.9')
+            response = self.attempt('other', '10.0.0.9')
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '15')
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_ip_taken_from_trusted_proxy(self):
+        """За прокси лимит считается по клиенту, а не по адресу nginx"""
+        for i in range(3):
+            self.attempt(f'user{i}', '127.0.0.1',
+                         HTTP_X_FORWARDED_FOR='10.0.0.9')
+        response = self.attempt('other', '127.0.0.1',
+                                HTTP_X_FORWARDED_FOR='10.0.0.10')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        # Подставленный клиентом адрес левее адреса от nginx не учитывается.
+        response = self.attempt('other', '127.0.0.1',
+                                HTTP_X_FORWARDED_FOR='1.2.3.4, 10.0.0.9')
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+
+
+class BoundedHasherTests(TestCase):
+    def test_compatible_and_measured(self):
+        """Хэши совместимы с PBKDF2 Django, время хэширования учитывается"""
+        stats.reset()
+        hasher = BoundedPBKDF2PasswordHasher()
+        encoded = hasher.encode('secret', hasher.salt())
+        self.assertTrue(PBKDF2PasswordHasher().verify('secret', encoded))
+        self.assertTrue(check_password('secret', encoded))
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['count'], 2)
+        self.assertGreater(snapshot['run_seconds'], 0)
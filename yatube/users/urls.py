@@ -6,6 +6,7 @@ from django.contrib.auth.views import (LogoutView, LoginView,
 from django.urls import path, reverse_lazy
 
 from . import views
+from .decorators import throttle_login
 
 app_name = 'users'
 
@@ -24,9 +25,9 @@ urlpatterns = [
     ),
     path(
         'login/',
-        LoginView.as_view(
+        throttle_login(LoginView.as_view(
             template_name='users/login.html'
-        ),
+        )),
         name='login'
     ),
     path(
@@ -1,8 +1,12 @@
 from django.views.generic import CreateView
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
+
+from core.decorators import ratelimit
 from .forms import CreationForm
 
 
+@method_decorator(ratelimit('signup', methods=('POST',)), name='dispatch')
 class SignUp(CreateView):
     form_class = CreationForm
     success_url = reverse_lazy('posts:index')
@@ -23,11 +23,14 @@ INSTALLED_APPS = [
     'posts.apps.PostsConfig',
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
+    'api.apps.ApiConfig',
+    'notifications.apps.NotificationsConfig',
     'sorl.thumbnail',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -44,14 +47,23 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Кэширующий загрузчик включён явно, независимо от DEBUG:
+            # каждый шаблон разбирается один раз на процесс.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.navigation.navigation',
+                'notifications.context_processors.unread',
             ],
         },
     },
@@ -95,11 +107,28 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+# Имена с хэшем содержимого и сжатые копии, созданные collectstatic.
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
 LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма ставятся в очередь (core.mail), отправляет их send_outbox
+# через OUTBOX_DELIVERY_BACKEND.
+EMAIL_BACKEND = 'core.mail.OutboxEmailBackend'
+
+OUTBOX_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+OUTBOX_BATCH_SIZE = 100
+
+# После стольких неудачных попыток письмо остаётся в таблице для разбора.
+OUTBOX_MAX_ATTEMPTS = 5
+
+# Задержка перед первой повторной попыткой, дальше она удваивается.
+OUTBOX_RETRY_DELAY = 60
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
@@ -109,8 +138,134 @@ MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Каталоги MEDIA_ROOT, доступные всем (картинки постов и их миниатюры).
+MEDIA_PUBLIC_PREFIXES = ('posts/', 'cache/', 'variants/')
+
+# Кто передаёт байты медиафайлов: None — сам Django (FileResponse),
+# 'x-accel' — nginx по X-Accel-Redirect, 'x-sendfile' — X-Sendfile.
+MEDIA_SENDFILE_BACKEND = None
+
+# internal location в nginx, указывающий на MEDIA_ROOT.
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24
+
+# В продакшене кэш должен быть общим для всех воркеров
+# (memcached или redis): в нём живут сессии и счётчики.
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
+
+# Сессии читаются из кэша, БД используется только при промахе.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Пользователь сессии тоже берётся из кэша. ModelBackend остаётся в
+# списке: сессии хранят путь бэкенда, и открытые до перехода на кэш
+# сессии без него были бы сброшены.
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+USER_CACHE_TIMEOUT = 60 * 15
+
+# Ограничение частоты записи, входа и регистрации:
+# {scope: (запросов, секунд)}.
+RATELIMITS = {
+    'post_create': (30, 60),
+    'add_comment': (60, 60),
+    'profile_follow': (120, 60),
+    'signup': (10, 60 * 60),
+    'login_ip': (30, 5 * 60),
+    'login_username': (10, 5 * 60),
+}
+
+# Адрес клиента для лимитов по IP: число прокси, дописывающих адрес
+# клиента в CLIENT_IP_HEADER. По умолчанию прокси нет и заголовку не
+# верим, иначе клиент подделал бы его; профиль gunicorn.conf.py за nginx
+# выставляет TRUSTED_PROXY_COUNT=1.
+CLIENT_IP_HEADER = 'HTTP_X_FORWARDED_FOR'
+
+TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', 0))
+
+# Отложенная запись комментариев: очередь сбрасывается в БД
+# командой flush_comments.
+COMMENTS_WRITE_BEHIND = False
+
+COMMENT_QUEUE_PATH = os.path.join(BASE_DIR, 'comment_queue.jsonl')
+
+COMMENT_QUEUE_OVERLAY_TIMEOUT = 60 * 10
+
+# Время жизни закэшированной карточки поста в лентах.
+POST_CARD_TIMEOUT = 60 * 60
+
+# Сколько хранить сгенерированную ленту (она сбрасывается и раньше,
+# при новой записи в её области).
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Поток уведомлений о новых записях (SSE): сколько держать соединение,
+# как часто проверять кэш и через сколько клиенту переподключаться.
+SSE_HOLD_SECONDS = 25
+
+SSE_POLL_SECONDS = 1
+
+SSE_RETRY_MS = 3000
+
+# Сколько потоков SSE процесс держит одновременно. Меньше числа потоков
+# воркера (gunicorn.conf.py), чтобы страницам всегда оставались потоки.
+SSE_MAX_STREAMS = 4
+
+SSE_BUSY_RETRY_MS = 15000
+
+# Сжатие ответов: порог в байтах, brotli (если установлен) и время
+# хранения сжатых копий в кэше.
+COMPRESSION_MIN_LENGTH = 1024
+
+COMPRESSION_BROTLI = True
+
+COMPRESSION_CACHE_TIMEOUT = 60 * 10
+
+# Адаптивные варианты картинок постов: ширины, пропорции кадра,
+# дополнительный WebP и качество сжатия.
+IMAGE_VARIANT_WIDTHS = (320, 640, 960)
+
+IMAGE_VARIANT_RATIO = (960, 339)
+
+IMAGE_VARIANT_WEBP = True
+
+IMAGE_VARIANT_QUALITY = 85
+
+# С какого размера таблицы админка показывает оценку числа строк
+# вместо точного COUNT(*).
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100000
+
+# Сколько секунд помеченные удалёнными записи и комментарии хранятся
+# (и могут быть восстановлены), прежде чем purge_deleted сотрёт их.
+SOFT_DELETE_RETENTION = 60 * 60 * 24 * 7
+
+# Записи старше этого числа дней archive_posts переносит в архивные
+# таблицы; ленты дочитывают архив после последней горячей записи.
+POST_ARCHIVE_AFTER = 365
+
+# Как долго кэшируется число непрочитанных уведомлений пользователя.
+NOTIFICATION_COUNT_TIMEOUT = 60 * 60
+
+# Как часто send_digests собирает накопленные уведомления в письма:
+# не больше одного письма пользователю за промежуток.
+NOTIFICATION_DIGEST_INTERVAL = 60 * 60
+
+# Адрес сайта для ссылок в письмах, которые отправляются вне запроса.
+SITE_URL = 'http://localhost:8000'
+
+# PBKDF2 с числом итераций Django, но в пуле из PASSWORD_HASH_WORKERS
+# потоков (users.hashers). Остальные хэшеры — как в Django по умолчанию.
+PASSWORD_HASHERS = [
+    'users.hashers.BoundedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+PASSWORD_HASH_WORKERS = 2
@@ -1,7 +1,19 @@
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+from core.static_app import StaticFilesApp  # noqa: E402
+from core.warmup import warm_templates  # noqa: E402
+
+# Разбираем шаблоны при старте воркера, а не на первом запросе.
+warm_templates()
+
+# Статику из STATIC_ROOT отдаём до Django, с вечным кэшированием.
+application = StaticFilesApp(
+    application, settings.STATIC_ROOT, settings.STATIC_URL
+)